@@ -1,65 +1,31 @@
+import time
+STARTED = time.perf_counter()
+
+import json
+import sys
 import threading
 import os
+from datetime import datetime
 from tkinter import *
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 from PIL import Image, ImageTk
-from Syllabus_Checker_For_GUI import check_syllabus
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase.pdfmetrics import stringWidth
-
-
-def save_report_as_pdf(text, filepath):
-    c = canvas.Canvas(filepath, pagesize=letter)
-    width, height = letter
-
-    left_margin = 50
-    right_margin = 50
-    usable_width = width - left_margin - right_margin
-
-    y = height - 60
-    line_height = 19
-    font_size = 15
-
-    c.setFont("Helvetica", font_size)
-
-    for line in text.split("\n"):
-        wrapped = []
-        current = ""
-        for word in line.split():
-            test = (current + " " + word).strip()
-            if stringWidth(test, "Helvetica", font_size) <= usable_width:
-                current = test
-            else:
-                if current:
-                    wrapped.append(current)
-                current = word
-        if current:
-            wrapped.append(current)
-
-        if not wrapped:
-            # blank line
-            y -= line_height
-            if y < 60:
-                c.showPage()
-                c.setFont("Helvetica", font_size)
-                y = height - 60
-            continue
-
-        for wline in wrapped:
-            c.drawString(left_margin, y, wline)
-            y -= line_height
-            if y < 60:
-                c.showPage()
-                c.setFont("Helvetica", font_size)
-                y = height - 60
-
-    c.save()
+from progress import AnalysisCancelled, CancelToken
+
+# Only tkinter / PIL (and the tiny progress module) are imported up front so the window shows right away.
+# The checker itself (pypdf, numpy, pyphen, reportlab, sentence_transformers,
+# torch) is imported and the model warmed up on a background thread while the
+# user picks a file; see _preload. Startup times are appended to
+# ~/.syllabus_checker/startup.jsonl, and `python SyllabusChecker.py --startup-check`
+# prints them and exits once the engine is ready.
+
+
+def startup_log_path():
+    return os.path.join(os.path.expanduser("~"), ".syllabus_checker", "startup.jsonl")
 
 
 class PennStateSyllabusApp:
-    def __init__(self, root):
+    def __init__(self, root, exit_when_ready=False):
         self.root = root
         self.root.title("Penn State Syllabus Checker")
         self.root.geometry("1200x800")
@@ -73,6 +39,17 @@ class PennStateSyllabusApp:
         self.ACCENT = "#FFCC00"
 
         self.file_path = None
+        self.report = None
+        # filled in by _preload: result cache (re-uploads of the same PDF) and
+        # score cache (policy text seen in earlier syllabi)
+        self.cache = None
+        self.score_cache = None
+        self.engine_ready = threading.Event()
+        self.engine_error = None
+        self.exit_when_ready = exit_when_ready
+        self.timings = {}
+        self.cancel_token = None
+        self._last_progress = None
 
         self.root.configure(bg=self.BG_BLUE)
 
@@ -217,6 +194,21 @@ class PennStateSyllabusApp:
         )
         self.analyze_btn.pack(side=LEFT, padx=10)
 
+        self.cancel_btn = Button(
+            btn_row,
+            text="■  Cancel",
+            font=("Segoe UI", 16, "bold"),
+            bg="#B91C1C",
+            fg=self.WHITE,
+            relief="flat",
+            padx=18,
+            pady=8,
+            cursor="hand2",
+            state=DISABLED,
+            command=self.cancel_check
+        )
+        self.cancel_btn.pack(side=LEFT, padx=10)
+
         self.save_btn = Button(
             btn_row,
             text="💾  Save Report",
@@ -233,6 +225,7 @@ class PennStateSyllabusApp:
 
         self._add_hover_button(self.select_btn, self.PSU_BLUE, "#1D4E9E", self.WHITE, self.WHITE)
         self._add_hover_button(self.analyze_btn, "#0E8044", "#0A5C31", self.WHITE, self.WHITE)
+        self._add_hover_button(self.cancel_btn, "#B91C1C", "#991B1B", self.WHITE, self.WHITE)
         self._add_hover_button(self.save_btn, "#E5E7EB", "#D1D5DB", "#222222", "#000000")
 
         # File label
@@ -295,12 +288,65 @@ class PennStateSyllabusApp:
 
         self.progress = ttk.Progressbar(
             status_frame,
-            mode="indeterminate",
+            mode="determinate",
+            maximum=100,
             length=220
         )
         self.progress.pack(side=RIGHT, padx=5)
         self.progress.stop()
 
+        self._set_status("Loading analysis engine...", self.PSU_BLUE)
+        self.root.after(0, self._first_frame)
+        threading.Thread(target=self._preload, daemon=True).start()
+
+    # ----------------- STARTUP ----------------------------------
+    def _first_frame(self):
+        self.root.update_idletasks()
+        self.timings["first_frame_seconds"] = round(time.perf_counter() - STARTED, 3)
+
+    def _preload(self):
+        # background thread: heavy imports, caches and one warm-up prediction
+        try:
+            import Syllabus_Checker_For_GUI  # noqa: F401  pypdf, numpy, pyphen
+            import report_render  # noqa: F401  reportlab
+            from model_registry import warm_up
+            from result_cache import ResultCache
+            from score_cache import ScoreCache
+
+            self.cache = ResultCache()
+            self.score_cache = ScoreCache()
+            warm_up()
+        except Exception as e:
+            self.engine_error = e
+        self.timings["engine_ready_seconds"] = round(time.perf_counter() - STARTED, 3)
+        self.engine_ready.set()
+        self.root.after(0, self._engine_loaded)
+
+    def _engine_loaded(self):
+        if self.engine_error is not None:
+            self._set_status("✗ Could not load the analysis engine", "#CC0000")
+        elif str(self.analyze_btn["state"]) == DISABLED:
+            pass  # an analysis was waiting for the engine and now has the status bar
+        elif self.file_path:
+            self._set_status("Ready to analyze", self.PSU_BLUE)
+        else:
+            self._set_status("✓ Analysis engine ready", "#0E8044")
+        self._record_startup()
+
+        if self.exit_when_ready:
+            print(json.dumps(self.timings))
+            self.root.destroy()
+
+    def _record_startup(self):
+        entry = {"date": datetime.now().isoformat(timespec="seconds"), **self.timings,
+                 "error": str(self.engine_error) if self.engine_error else None}
+        try:
+            os.makedirs(os.path.dirname(startup_log_path()), exist_ok=True)
+            with open(startup_log_path(), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+
     # ----------------- HELPER METHODS ---------------------------
     def _add_hover_button(self, btn, bg_normal, bg_hover, fg_normal, fg_hover):
         def on_enter(e):
@@ -328,31 +374,6 @@ class PennStateSyllabusApp:
         self.status.config(text=text, fg=color)
         self.root.update_idletasks()
 
-    def _insert_rich_text(self, msg):
-        import re
-        pattern = r'<color=(#[0-9A-Fa-f]{6})>(.*?)</color>'
-        pos = 0
-        for match in re.finditer(pattern, msg, flags=re.S):
-            start, end = match.span()
-            if start > pos:
-                self.output.insert(END, msg[pos:start])
-
-            color = match.group(1)
-            text = match.group(2)
-
-            tag_name = f"color_{color}"
-            if tag_name not in self.output.tag_names():
-                self.output.tag_config(tag_name, foreground=color, font=("Segoe UI", 15, "bold"))
-
-            self.output.insert(END, text, tag_name)
-            pos = end
-
-        if pos < len(msg):
-            self.output.insert(END, msg[pos:])
-
-        self.output.insert(END, "\n")
-        # IMPORTANT: do NOT self.output.see(END) here – we want to stay at the top
-
     # ------------------ MAIN ACTIONS ----------------------------
     def select_file(self):
         path = filedialog.askopenfilename(
@@ -365,7 +386,8 @@ class PennStateSyllabusApp:
                 text=f"✓ {os.path.basename(path)}",
                 fg="#1D4E9E"
             )
-            self._set_status("Ready to analyze", self.PSU_BLUE)
+            if self.engine_ready.is_set():
+                self._set_status("Ready to analyze", self.PSU_BLUE)
 
     def run_file_check(self):
         if not self.file_path:
@@ -374,50 +396,117 @@ class PennStateSyllabusApp:
 
         self.output.delete("1.0", END)
         self._set_status("Analyzing syllabus...", self.ACCENT)
-        self.progress.start(10)
+        self._set_running(True)
 
-        self.analyze_btn.config(state=DISABLED)
-        self.select_btn.config(state=DISABLED)
-        self.save_btn.config(state=DISABLED)
+        if not self.engine_ready.is_set():
+            self._set_status("Waiting for the analysis engine to load...", self.ACCENT)
+            # no real progress to show until the engine is there
+            self.progress.config(mode="indeterminate")
+            self.progress.start(10)
+
+        # the worker thread only reads the token, Cancel sets it
+        token = self.cancel_token = CancelToken()
+        self._last_progress = None
 
         def worker():
             try:
-                report = check_syllabus(self.file_path)
-                self.root.after(0, lambda: self._display_report(report))
+                self.engine_ready.wait()
+                if self.engine_error is not None:
+                    raise self.engine_error
+                from Syllabus_Checker_For_GUI import check_syllabus
+                from metrics import AnalysisMetrics
+
+                self.root.after(0, lambda: self._set_status("Analyzing syllabus...", self.ACCENT))
+                metrics = AnalysisMetrics()
+                report = check_syllabus(self.file_path, cache=self.cache, metrics=metrics,
+                                        score_cache=self.score_cache,
+                                        progress=self._on_progress, cancel=token)
+                self.root.after(0, lambda: self._display_report(report, metrics))
+            except AnalysisCancelled:
+                self.root.after(0, self._display_cancelled)
             except Exception as e:
                 self.root.after(0, lambda err=e: self._display_error(err))
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _display_report(self, report):
-        self.progress.stop()
-        self._set_status("✓ Analysis complete", "#0E8044")
+    def cancel_check(self):
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+            self.cancel_btn.config(state=DISABLED)
+            self._set_status("Cancelling...", self.ACCENT)
+
+    # weights of each stage in the progress bar (reading pages, then scoring)
+    PROGRESS_SPANS = {"extract": (0, 40), "scoring": (40, 95), "sections": (95, 100)}
+
+    def _on_progress(self, stage, done, total):
+        # called on the worker thread; only hand Tk an update when the bar would move
+        start, end = self.PROGRESS_SPANS.get(stage, (0, 100))
+        percent = int(start + (end - start) * done / max(total, 1))
+        key = (stage, percent) if stage != "extract" else (stage, done)
+        if key == self._last_progress:
+            return
+        self._last_progress = key
+        self.root.after(0, lambda: self._show_progress(stage, done, total, percent))
+
+    def _show_progress(self, stage, done, total, percent):
+        if self.cancel_token is None or self.cancel_token.cancelled:
+            return
+        if str(self.progress["mode"]) != "determinate":
+            self.progress.stop()
+            self.progress.config(mode="determinate")
+        self.progress["value"] = percent
+        if stage == "extract":
+            self._set_status(f"Reading page {done} of {total}...", self.ACCENT)
+        elif stage == "scoring":
+            self._set_status(f"Checking sections... {int(100 * done / max(total, 1))}%", self.ACCENT)
+        elif stage == "sections":
+            self._set_status(f"{done} of {total} sections checked, rating readability...", self.ACCENT)
+
+    def _set_running(self, running):
+        state = DISABLED if running else NORMAL
+        self.analyze_btn.config(state=state)
+        self.select_btn.config(state=state)
+        self.save_btn.config(state=state)
+        self.cancel_btn.config(state=NORMAL if running else DISABLED)
+        if not running:
+            self.cancel_token = None
+            self.progress.stop()
+            self.progress.config(mode="determinate")
+            self.progress["value"] = 0
+
+    def _display_report(self, report, metrics=None):
+        from report_render import render_tk
+
+        self._set_running(False)
+        self.report = report
+        if metrics is not None:
+            self._set_status(f"✓ Analysis complete in {metrics.summary()}", "#0E8044")
+        else:
+            self._set_status("✓ Analysis complete", "#0E8044")
 
         self.output.delete("1.0", END)
-        self._insert_rich_text(report)
+        render_tk(report, self.output)
 
         # Scroll to top so user sees the beginning, not the bottom
         self.output.yview_moveto(0.0)
 
-        self.analyze_btn.config(state=NORMAL)
-        self.select_btn.config(state=NORMAL)
-        self.save_btn.config(state=NORMAL)
-
     def _display_error(self, error):
-        self.progress.stop()
+        self._set_running(False)
+        self.report = None
         self._set_status("✗ Analysis failed", "#CC0000")
 
         self.output.delete("1.0", END)
         self.output.insert(END, f"Error during analysis:\n\n{error}")
         self.output.yview_moveto(0.0)
 
-        self.analyze_btn.config(state=NORMAL)
-        self.select_btn.config(state=NORMAL)
-        self.save_btn.config(state=NORMAL)
+    def _display_cancelled(self):
+        self._set_running(False)
+        self.report = None
+        self._set_status("Analysis cancelled", self.PSU_BLUE)
+        self.output.delete("1.0", END)
 
     def save_report(self):
-        text = self.output.get("1.0", END).strip()
-        if not text:
+        if self.report is None:
             messagebox.showerror("Error", "No report to save.")
             return
 
@@ -426,11 +515,17 @@ class PennStateSyllabusApp:
             filetypes=[("PDF File", "*.pdf")]
         )
         if save_path:
-            save_report_as_pdf(text, save_path)
+            from report_render import render_pdf
+            render_pdf(self.report, save_path)
             self._set_status("✓ Report saved as PDF", "#0E8044")
 
 
 if __name__ == "__main__":
+    # long PDFs are extracted in spawned worker processes (pdf_extract.py); in the
+    # frozen SyllabusChecker.exe those must run the worker, not start the app again
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     root = Tk()
-    app = PennStateSyllabusApp(root)
+    app = PennStateSyllabusApp(root, exit_when_ready="--startup-check" in sys.argv[1:])
     root.mainloop()
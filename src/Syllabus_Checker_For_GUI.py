@@ -1,19 +1,141 @@
 from pypdf import PdfReader
 import os
-from sentence_transformers import CrossEncoder
+from functools import partial
 import re
-import numpy as np
-import textstat
+from model_registry import resolve_model, model_name
+from section_scoring import detect_sections
+from page_pipeline import iter_page_texts, stream_sections
+from segmenter import segment, split_sentences
+from boilerplate import strip_repeated_lines
+from metrics import AnalysisMetrics, CountingModel
+from result_cache import cache_key, file_digest
+from score_cache import CachedScorer
+from progress import ProgressModel, watch_pages
+from length_batching import DEFAULT_TOKEN_BUDGET, BucketedModel
+from pdf_extract import extract_pages
+from report import ReadabilityResult, SectionResult, SyllabusReport
+from readability import readability_scores
+from rubric import Rubric, load_rubric
+import bi_encoder
+
+
+# The rubric (required sections and their keywords, thresholds, recommendation /
+# kudos messages and the readability bands per course level) is loaded from
+# rubric.json once, see rubric.py. The names below are the rubric in use when
+# this module was imported, kept for code that imports them directly.
+RUBRIC = load_rubric()
+REQUIRED_SECTIONS = RUBRIC.sections
+SECTION_RECOMMENDATIONS = RUBRIC.recommendations
+SECTION_KUDOS = RUBRIC.kudos
+READABILITY_LEVELS = RUBRIC.readability_levels
+THRESHOLD = RUBRIC.threshold
+
+
+def rate_readability(sentences, level, levels=None):
+    # readability scores and where they land for this course level
+    # (levels: the rubric's readability_levels, default: the current rubric)
+    levels = levels or load_rubric().readability_levels
+    text = " ".join(sentences).strip()
+
+    # Scores (same numbers as textstat, from a single pass over the text)
+    scores = readability_scores(text)
+    fre = scores["flesch_reading_ease"]
+    fk = scores["flesch_kincaid_grade"]
+    fog = scores["gunning_fog"]
+
+    fre_easy, fre_pref, fre_warn = levels[level]["FRE"]
+    fk_min, fk_max = levels[level]["FK"]
+    fog_min, fog_max = levels[level]["FOG"]
+
+    # clarity and flow will represent flesch reading ease
+    if fre >= fre_easy:
+        clarity = "easy"
+    elif fre >= fre_pref:
+        clarity = "ideal"
+    elif fre >= fre_warn:
+        clarity = "dense"
+    else:
+        clarity = "hard"
+
+    # is it appropriate for course level? --> flesch kincaid grade
+    if fk < fk_min:
+        level_band = "low"
+    elif fk <= fk_max:
+        level_band = "ok"
+    else:
+        level_band = "high"
 
+    # word choice and complexity will represent gunning fog index
+    if fog < fog_min:
+        complexity = "low"
+    elif fog <= fog_max:
+        complexity = "ok"
+    else:
+        complexity = "high"
 
-def check_syllabus(file_path):
-    outputs = []
+    # pass/fail logic
+    passes = sum([fre >= fre_pref, level_band == "ok", complexity == "ok"])
+
+    return ReadabilityResult(fre, fk, fog, clarity, level_band, complexity, passes)
+
+
+def grade_for(total_score):
+    if total_score >= 120:
+        return "EXCELLENT"
+    elif total_score >= 100:
+        return "GREAT"
+    elif total_score >= 80:
+        return "GOOD"
+    elif total_score >= 60:
+        return "ADEQUATE"
+    return "INCOMPLETE"
+
+
+def check_syllabus(file_path, model=None, prefilter_k=None, phrase_fast_path=True, cache=None,
+                   streaming=False, strip_boilerplate=True, metrics=None, engine="cross", score_cache=None,
+                   progress=None, cancel=None, extract_workers=None, backend=None,
+                   token_budget=DEFAULT_TOKEN_BUDGET, rubric=None, segmented=True):
+    # model can be a loaded CrossEncoder, a model name / path, or None for the shared default
+    # engine: "cross" (CrossEncoder, most accurate) or "bi" (sentence-transformers bi-encoder,
+    #         much faster; model is then a SentenceTransformer / name and per-section
+    #         thresholds from bi_encoder.load_thresholds() are used instead of THRESHOLD)
+    # prefilter_k: if set, only the top-k lexical (BM25) matches per section are scored by the model
+    # phrase_fast_path: sections with a verbatim keyword phrase (e.g. "academic integrity") skip the model
+    # cache: optional result_cache.ResultCache, re-uploads of the same PDF are answered from it
+    # streaming: score page by page and stop reading once all sections are found
+    #            (readability then only covers the pages that were read; prefilter_k is not used)
+    # strip_boilerplate: drop header / footer lines repeated on most pages before splitting
+    #            (needs every page, so not done when streaming; repeated lines are still scored only once)
+    # metrics: optional metrics.AnalysisMetrics, filled with per-stage wall / cpu time and counters
+    # score_cache: optional score_cache.ScoreCache; (keyword, sentence) pairs scored for an earlier
+    #            syllabus (copied policy text) are read from it instead of going to the model
+    # progress: optional progress(stage, done, total) callback, cancel: optional progress.CancelToken;
+    #            the token is checked between pages and model batches (raises progress.AnalysisCancelled)
+    # extract_workers: processes for page text extraction of long PDFs (None = available CPUs,
+    #            1 = sequential); short PDFs and streaming are always sequential
+    # backend: how a CrossEncoder given by name runs: "torch", "int8" or "onnx"
+    #            (None = SYLLABUS_CHECKER_BACKEND or torch, see inference_backends.py)
+    # token_budget: pairs are sorted by length and batched up to this many padded tokens
+    #            per forward pass (length_batching.py); None keeps document order in fixed batches
+    # rubric: a rubric.Rubric or the path of a rubric file (None = $SYLLABUS_CHECKER_RUBRIC or rubric.json)
+    # segmented: score de-duplicated sentences with long chunks cut into windows (segmenter.py);
+    #            False scores every split sentence as it is (the golden.py reference).
+    #            Streaming always segments, it needs the de-duplication across pages
+    # returns a report.SyllabusReport; use report_render to turn it into text / Tk / PDF / JSON
+    warnings = []
+
+    if prefilter_k is not None and prefilter_k < 1:
+        raise ValueError("prefilter_k must be at least 1.")
+    if engine not in ("cross", "bi"):
+        raise ValueError(f"Unknown engine '{engine}', expected 'cross' or 'bi'.")
+    if not isinstance(rubric, Rubric):
+        rubric = load_rubric(rubric)
 
     # Validate file
     if not os.path.isfile(file_path):
-        return "Error: The file does not exist."
+        return SyllabusReport(error="Error: The file does not exist.")
     elif not file_path.lower().endswith(".pdf"):
-        return "Error: Only PDF files are accepted."
+        return SyllabusReport(error="Error: Only PDF files are accepted.")
 
     # Parse filename
     file_name = os.path.basename(file_path).replace(".pdf", "")
@@ -28,32 +150,9 @@ def check_syllabus(file_path):
         instructor = parts[1]
         semester = parts[2]
     else:
-        outputs.append("Warning: Unexpected filename format.")
+        warnings.append("Warning: Unexpected filename format.")
         course = instructor = semester = "Unknown"
 
-    outputs.append(f"COURSE: {course}, INSTRUCTOR: {instructor}, SEMESTER: {semester}")
-
-    # Extract text from PDF
-    reader = PdfReader(file_path)
-    all_text = ""
-    for i, page in enumerate(reader.pages, start=1):
-        text = page.extract_text()
-        if text:
-            all_text += text + "\n"
-        else:
-            all_text += f"\n--- Page {i} ---\n[No Text Found]\n"
-
-    # Load model
-    model = CrossEncoder("cross-encoder/ms-marco-MiniLM-L6-v2")
-
-#split into sentences
-    raw_chunks = re.split(r'(?<=[.!?])\s+|\n+', all_text)
-    sentences = [
-        s.strip()
-        for s in raw_chunks
-        if (len(s.split()) >= 2 and re.search(r"[A-Za-z]{3,}", s))
-    ]
-
     # derive course_level from the existing parse
     # normalize course numbers so that "83" becomes "083" etc.
 
@@ -94,298 +193,137 @@ def check_syllabus(file_path):
 
     # convert to an integer, and if its not part of the level dict, throw error
     course_level = int(level_char)
-    if course_level not in (0, 1, 2, 3, 4):
+    if course_level not in rubric.readability_levels:
         raise ValueError(
             f"Unsupported course level '{course_level}' in '{file_name}'. "
             "Expected 0–4 (e.g., BIO_004, ENG.101, CMPSC_203, ENGL.302, CMPSC_463)."
         )
 
-    # Readability Analysis
-    def rate_readability(sentences, level):
-        # calculates readability and then deducts points form score. we can change later just how i decided to implement for now.
-        text = " ".join(sentences).strip()
-
-        # Scores
-        fre = textstat.flesch_reading_ease(text)
-        fk = textstat.flesch_kincaid_grade(text)
-        fog = textstat.gunning_fog(text)
-
-        # more forgiving bounds so we do not over-flag syllabi as "difficult"
-        # FRE: (easy_threshold, ideal_min, warn_min)
-        # FK:  (ideal_min, ideal_max)
-        # FOG: (ideal_min, ideal_max)
-        LEVEL = {
-            0: {"FRE": (65, 40, 25), "FK": (9, 16), "FOG": (8, 16)},
-            1: {"FRE": (60, 30, 25), "FK": (10, 18), "FOG": (10, 18)},
-            2: {"FRE": (60, 35, 20), "FK": (10, 20), "FOG": (10, 20)},
-            3: {"FRE": (50, 30, 10), "FK": (11, 22), "FOG": (10, 22)},
-            4: {"FRE": (40, 10, 0),  "FK": (12, 25), "FOG": (10, 25)}
-        }
-
-        fre_easy, fre_pref, fre_warn = LEVEL[level]["FRE"]
-        fk_min, fk_max = LEVEL[level]["FK"]
-        fog_min, fog_max = LEVEL[level]["FOG"]
-
-        # pass/fail logic
-        clarity_ok = fre >= fre_pref
-        level_ok = fk_min <= fk <= fk_max
-        complexity_ok = fog_min <= fog <= fog_max
-
-        passes = sum([clarity_ok, level_ok, complexity_ok])
-
-        # result message + color
-        if passes == 3:
-            overall = "GREAT! Your syllabus is clear and easy to understand."
-            overall_color = "#00FF00"  # Green
-        elif passes == 2:
-            overall = "GOOD, BUT COULD USE SOME IMPROVEMENT."
-            overall_color = "#FFFF00"  # Yellow
+    # timings / counters always go somewhere, even if the caller did not ask for them
+    if metrics is None:
+        metrics = AnalysisMetrics()
+
+    # same PDF bytes + same model / rubric / options -> same report, skip all the work
+    key = None
+    if cache is not None:
+        with metrics.stage("cache_lookup"):
+            # the file name is part of the key too: course / instructor / level come from it
+            options = {"file_name": file_name, "prefilter_k": prefilter_k,
+                       "phrase_fast_path": phrase_fast_path, "streaming": streaming,
+                       "strip_boilerplate": strip_boilerplate, "engine": engine, "segmented": segmented}
+            if engine == "bi":
+                # an encoder object without a name cannot be told apart from another one
+                name = bi_encoder.encoder_name(model)
+                if name:
+                    key = cache_key(file_digest(file_path), name, rubric.digest,
+                                    bi_encoder.load_thresholds(name=name), options)
+            else:
+                key = cache_key(file_digest(file_path), model_name(model, backend), rubric.digest,
+                                rubric.thresholds, options)
+            cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            metrics.count("cache_hits")
+            return SyllabusReport.from_dict(cached)
+        metrics.count("cache_misses")
+
+    # Extract text from PDF
+    with metrics.stage("extract"):
+        reader = PdfReader(file_path)
+        pages_total = len(reader.pages)
+
+    # Load model (cached for the whole process, see model_registry)
+    with metrics.stage("model_load"):
+        if engine == "bi":
+            # the store / thresholds go by the requested name, not by what the wrappers look like
+            name = bi_encoder.encoder_name(model)
+            model = CountingModel(bi_encoder.resolve_encoder(model), metrics)
+            if progress is not None or cancel is not None:
+                model = ProgressModel(model, progress, cancel)
+            detect = partial(bi_encoder.bi_detect_sections, name=name)
+            threshold = bi_encoder.load_thresholds(name=name) if name else {}
         else:
-            overall = "NEEDS IMPROVEMENT. Some parts may be difficult for students to understand."
-            overall_color = "#FF0000"  # Red
-
-        outputs.append("\n\nREADABILITY REPORT")
-        outputs.append(f"OVERALL RESULT: <color={overall_color}>{overall}</color>")
-
-        # clarity and flow will represent flesch reading ease
-        outputs.append("\nClarity and Flow:")
-        outputs.append("  → Think of this as how smoothly the syllabus reads on a first pass.")
-
-        if fre >= fre_easy:
-            # Very easy – clear, but might be a bit simple for higher-level courses
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - Sentences are short, clear, and easy to follow.")
-            outputs.append("    - Students can quickly understand what you mean.")
-            outputs.append("  Suggestions:")
-            outputs.append("    - If this is a higher-level course, consider adding a bit more detail or discipline-specific phrasing while keeping sentences clear.")
-        elif fre_pref <= fre < fre_easy:
-            # Ideal zone → only kudos, no suggestions
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - The syllabus flows smoothly for college readers.")
-            outputs.append("    - Information is clear without feeling oversimplified or overly dense.")
-            outputs.append("  Keep doing what you are doing with sentence length and flow.")
-        elif fre_warn <= fre < fre_pref:
-            # Slightly challenging, but not terrible
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - You provide detailed information that reflects the rigor of the course.")
-            outputs.append("  Suggestions:")
-            outputs.append("    - Shorten or split up longer sentences so each one focuses on a single idea.")
-            outputs.append("    - Remove extra filler words or repeated phrases to make the text feel lighter.")
-        else:  # fre < fre_warn, quite hard
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - The syllabus appears thorough and covers important information.")
-            outputs.append("  Suggestions:")
-            outputs.append("    - Break up large blocks of text with headings or bullet points.")
-            outputs.append("    - Use shorter, more direct sentences for key expectations.")
-            outputs.append("    - Put the most important point at the beginning of the sentence whenever possible.")
-
-        # is it appropriate for course level? --> going to represent flesch kincaid grade
-        outputs.append("\nAppropriate for Course Level:")
-        outputs.append("  → Think of this as whether the reading feels like it matches a course at this level.")
-
-        if level_ok:
-            # Ideal FK range → only kudos
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - The reading level fits what we expect for this course level.")
-            outputs.append("    - The tone feels professional while still being accessible to students.")
-            outputs.append("  Keep this balance of academic language and clarity.")
-        elif fk < fk_min:
-            # Too simple for the level
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - The syllabus is very accessible and friendly to read.")
-            outputs.append("  Suggestions:")
-            outputs.append("    - Add a bit more academic or discipline-specific language where it helps clarify expectations.")
-            outputs.append("    - Provide slightly more detail in key sections, such as major assignments or grading criteria.")
-        else:  # fk > fk_max, too advanced
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - The writing reflects a serious, academic tone appropriate for higher education.")
-            outputs.append("  Suggestions:")
-            outputs.append("    - Simplify longer or highly formal sentences, especially in policy-heavy areas.")
-            outputs.append("    - Make instructions and deadlines as direct and straightforward as possible.")
-            outputs.append("    - Briefly define specialized terms when they first appear.")
-
-        # word choice and complexity will represent gunning fog index
-        outputs.append("\nWord Choice and Complexity:")
-        outputs.append("  → Think of this as how heavy the wording feels, based on sentence length and bigger words.")
-
-        if fog < fog_min:
-            # Very simple wording
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - Vocabulary is straightforward and easy to understand.")
-            outputs.append("    - Students can quickly grasp what you are saying without getting stuck on the wording.")
-            outputs.append("  Suggestions:")
-            outputs.append("    - For upper-level or writing-intensive courses, consider adding key discipline-specific terms where appropriate.")
-            outputs.append("    - Make sure important concepts are described with enough precision, even while staying clear.")
-        elif fog_min <= fog <= fog_max:
-            # Ideal zone → only kudos
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - Word choice feels balanced: not too simple, but not overly dense.")
-            outputs.append("    - Complex ideas are explained in a way that students can process without feeling overwhelmed.")
-            outputs.append("  Keep this mix of everyday language and necessary academic terms.")
-        else:  # fog > fog_max, too dense
-            outputs.append("  ✓ What you did well:")
-            outputs.append("    - The syllabus shows strong command of the subject and covers a lot of information.")
-            outputs.append("  Suggestions:")
-            outputs.append("    - Replace very long or technical words with simpler alternatives when possible.")
-            outputs.append("    - Shorten dense sections and avoid packing too many ideas into a single sentence.")
-            outputs.append("    - Use bullet points or numbered lists for complex rules or multi-step processes.")
-
-
-        # if at most 1 test passes, then we add more overall suggestions for user.
-        if passes <= 1:
-            outputs.append("\nOverall Suggestions:")
-            outputs.append("  • Use bullet points for key policies, deadlines, and grading details.")
-            outputs.append("  • Add clear section headers so students can quickly find what they need.")
-            outputs.append("  • Keep the most important rules short, direct, and easy to scan.")
-
-        return
-################################################################################################
-
-
-
-    # Required sections (now lists of keywords instead of one long sentence)
-    required_sections = {
-        "Contact Information": ["instructor contact", "email"],
-        "Course Materials": ["textbook", "course materials", "required texts"],
-        "Course Content and Expectations": ["course content", "course expectations", "learning outcomes", "course summary"],
-        "Location and Meeting Times": ["meeting times", "class meeting", "classroom location", "class time"],
-        "Course Goals and Objectives": ["course goals", "course objectives", "learning objectives"],
-        "Grade Breakdown": ["grade breakdown", "grading scale", "final grade percentage", "grade determination", "final grade"],
-        "Examination Policy": ["examination policy", "exam policy", "makeup exam", "no makeups", "exams", "quizzes"],
-        "Attendance Policy": ["attendance policy", "attendance is required", "attendance will be taken", "attend"],
-        "Academic Integrity Statement": ["academic integrity", "plagiarism", "academic honesty"],
-        "Counseling Services": ["counseling and psychological services"],
-        "Disability Resources": ["student disability resources", "disabilities", "accommodations"],
-        "Educational Equity Statement": ["educational equity", "diversity and inclusion", "report bias"],
-        "Campus Closure Policy": ["campus closure", "class cancellation"]
-    }
-
-    # Recommendations for missing sections
-    section_recommendations = {
-        "Contact Information": "Contact information for all course instructors (including undergraduate or graduate assistants), such as email or phone numbers.",
-        "Course Materials": "List all required textbooks, readings, and course materials.",
-        "Course Content and Expectations": "The content of this course, and the expectations of what a student should know / be able to do at its conclusion should be featured in detail.",
-        "Location and Meeting Times": "Include the classroom location, building name/number, and meeting days/times for the course.",
-        "Course Goals and Objectives": "Course Goals describe the broad knowledge domains and expectations for the course. Course Objectives align with course goals, but are more explicit and represent behaviors,skills, or attitudes that students will learn and demonstrate in the course; objectives are assessed through class activities, assignments, examinations, and/or projects.",
-        "Grade Breakdown": "Provide a clear breakdown of how final grades are calculated, and pertain to what letter grade.",
-        "Examination Policy": "The course exam policy should include the dates, times and locations of all exams. The syllabus should also note if exams will be administered outside of class time.",
-        "Attendance Policy": "Clearly state your attendance expectations, including how absences affect grades, whether excused absences are allowed, and the procedure for notifying you of absences.",
-        "Academic Integrity Statement": "Include Penn State's academic integrity policy and consequences for violations like plagiarism.",
-        "Counseling Services": "Provide information about campus counseling and psychological services (CAPS) for student mental health support.",
-        "Disability Resources": "Information on procedures related to academic adjustments identified by Student Disability Resources.",
-        "Educational Equity Statement": "Provide information related to reporting educational bias through the report bias site.",
-        "Campus Closure Policy": "Explain procedures for class cancellations due to weather, emergencies, or other campus closures."
-    }
-
-    # Kudos messages for found sections
-    section_kudos = {
-        "Contact Information": "Great! Students will be able to easily reach you with questions or concerns.",
-        "Course Materials": "Excellent! Students know exactly what materials they need to purchase or access.",
-        "Course Content and Expectations": "Well done! Students have a clear understanding of what the course covers and what's expected of them.",
-        "Location and Meeting Times": "Perfect! Students know where and when to show up for class.",
-        "Course Goals and Objectives": "Fantastic! Clear learning objectives help students understand what they'll achieve in this course.",
-        "Grade Breakdown": "Excellent! Students can see exactly how their performance will be evaluated.",
-        "Examination Policy": "Great job! Students know what to expect regarding exams and assessments.",
-        "Attendance Policy": "Well done! Students understand your expectations regarding attendance and absences.",
-        "Academic Integrity Statement": "Excellent! This sets clear expectations about academic honesty and ethical behavior.",
-        "Counseling Services": "Thank you for including this! Students now know where to find mental health support.",
-        "Disability Resources": "Great! Students with disabilities know how to request accommodations.",
-        "Educational Equity Statement": "Wonderful! This promotes an inclusive and welcoming learning environment.",
-        "Campus Closure Policy": "Good thinking! Students know what to do if campus closes unexpectedly."
-    }
-
-
-    # 1. CONTENT ANALYSIS (FIRST BLOCK)
-    outputs.append("\n\nCONTENT ANALYSIS REPORT")
-
-    score = 0
-    threshold = 0.4
-    results = {}
-
-
-    # fix to find keywords and to always add or sub if found, not found
-    for section, keywords in required_sections.items():
-
-
-        best_score = 0
-        best_sentence = ""
-        found = False
-
-        for kw in keywords:
-            scores = model.predict([(kw.lower(), s.lower()) for s in sentences], show_progress_bar=False)
-            probs = 1 / (1 + np.exp(-scores))
-
-            # find best match for this keyword
-            sentence, prob = sorted(zip(sentences, probs), key=lambda x: x[1], reverse=True)[0]
-
-            if prob > best_score:
-                best_score = prob
-                best_sentence = sentence
-
-        found = best_score >= threshold  # use section-specific threshold
-
-        results[section] = {
-            "found": found,
-            "score": best_score,
-            "sentence": best_sentence
-        }
-
-        status = "✓ Found" if found else "✗ Not Found"
-        outputs.append(f"{section:<35} {status:<12}")
-
-        if found:
-            score += 10
-
-    # Summary
-    missing = [sec for sec, r in results.items() if not r["found"]]
-    found_ok = [sec for sec, r in results.items() if r["found"]]
-    total_score = score
-
-    # 3. FINAL SUMMARY (SECOND BLOCK)
-    if total_score >= 120:
-        grade = "EXCELLENT"
-        grade_color = "#00FF00"  # Green
-    elif total_score >= 100:
-        grade = "GREAT"
-        grade_color = "#00FF00"  # Green
-    elif total_score >= 80:
-        grade = "GOOD"
-        grade_color = "#00FF00"  # Green
-    elif total_score >= 60:
-        grade = "ADEQUATE"
-        grade_color = "#00FF00"  # Green
+            resolved = resolve_model(model, backend)
+            model = CountingModel(resolved, metrics)
+            if token_budget:
+                model = BucketedModel(model, token_budget, progress=progress, cancel=cancel, metrics=metrics)
+            elif progress is not None or cancel is not None:
+                model = ProgressModel(model, progress, cancel)
+            if score_cache is not None:
+                model = CachedScorer(model, score_cache, model_name(resolved), metrics)
+            detect, threshold = detect_sections, rubric.thresholds
+
+    boilerplate_removed = 0
+    empty_pages = []
+    if streaming:
+        # extract, split and score page by page; stops reading once every section is found
+        with metrics.stage("stream"):
+            results, sentences, pages_read = stream_sections(
+                model, rubric.sections, watch_pages(iter_page_texts(reader), pages_total, progress, cancel),
+                threshold,
+                phrase_fast_path=phrase_fast_path, detect=detect, progress=progress)
+        scored = None
     else:
-        grade = "INCOMPLETE"
-        grade_color = "#FF0000"  # Red
-
-    outputs.append("\n\nFINAL SUMMARY")
-    outputs.append(f"GRADE: <color={grade_color}>{grade}</color>")
-    outputs.append("")
-
-    if missing:
-        outputs.append("\nSections Not Found:")
-        for sec in missing:
-            outputs.append(f"  ✗ {sec}")
-        outputs.append("\nSections Found:")
-        for sec in found_ok:
-            outputs.append(f"  ✓ {sec}")
-
-    # 4. RECOMMENDATIONS (THIRD BLOCK)
-    if missing:
-        outputs.append("\n\nRECOMMENDATIONS FOR SECTIONS NOT FOUND")
-        for sec in missing:
-            outputs.append(f"\n• {sec}:")
-            outputs.append(f"  → {section_recommendations[sec]}")
-
-    # 2. READABILITY REPORT (FOURTH BLOCK — PRINTED HERE)
-
-    rate_readability(sentences, course_level)
-
-    # 5. KUDOS (LAST BLOCK)
-    if found_ok:
-        outputs.append("\n\nKUDOS FOR SECTIONS FOUND")
-        for sec in found_ok:
-            outputs.append(f"\n• {sec}:")
-            outputs.append(f"  ✓ {section_kudos[sec]}")
-
-    return "\n".join(outputs)
+        with metrics.stage("extract"):
+            pages, empty_pages = extract_pages(file_path, reader, workers=extract_workers,
+                                               progress=progress, cancel=cancel)
+            page_texts = [text for _, text in pages]
+            if strip_boilerplate:
+                page_texts, boilerplate_removed = strip_repeated_lines(page_texts)
+            all_text = "".join(page_texts)
+            sentences = split_sentences(all_text)
+            pages_read = pages_total
+
+            # duplicates are scored once and long chunks are cut into windows
+            texts = segment(sentences).texts if segmented else sentences
+        scored = len(texts)
+
+        # score every (keyword, sentence) pair in one batched pass, then pick the best per section
+        with metrics.stage("scoring"):
+            results = detect(model, rubric.sections, texts, threshold,
+                             prefilter_k=prefilter_k, phrase_fast_path=phrase_fast_path)
+        if progress is not None:
+            progress("sections", len(results), len(rubric.sections))
+
+    metrics.count("pages", pages_read)
+    if empty_pages:
+        metrics.count("empty_pages", len(empty_pages))
+    metrics.count("sentences", len(sentences))
+    if scored is not None:
+        metrics.count("scored_sentences", scored)
+
+    sections = [
+        SectionResult(name, bool(r["found"]), None if r["score"] is None else float(r["score"]),
+                      r["sentence"], r["matched_by"])
+        for name, r in results.items()
+    ]
+    total_score = 10 * sum(s.found for s in sections)
+
+    if cancel is not None:
+        cancel.check()
+    with metrics.stage("readability"):
+        readability = rate_readability(sentences, course_level, rubric.readability_levels)
+
+    report = SyllabusReport(
+        file_name=file_name,
+        course=course,
+        instructor=instructor,
+        semester=semester,
+        course_level=course_level,
+        sections=sections,
+        readability=readability,
+        score=total_score,
+        grade=grade_for(total_score),
+        pages_read=pages_read,
+        pages_total=pages_total,
+        boilerplate_removed=boilerplate_removed,
+        empty_pages=empty_pages,
+        rubric=rubric.label,
+        rubric_path=rubric.path,
+        warnings=warnings,
+    )
+
+    if key is not None:
+        with metrics.stage("cache_store"):
+            cache.put(key, report.to_dict())
+
+    return report
@@ -0,0 +1,245 @@
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from inference_backends import BACKENDS
+
+# Headless batch mode: analyze a whole folder (or glob) of syllabi with a pool
+# of worker processes. Each worker loads the model once, results are streamed
+# to a JSONL file as they finish, and files already analyzed in that file are
+# skipped (files that failed there are tried again).
+#
+#   python batch_check.py syllabi/ -o results.jsonl --workers 4
+
+_options = {}
+
+
+def find_pdfs(inputs, recursive=False):
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, "**", "*.pdf") if recursive else os.path.join(item, "*.pdf")
+            files.extend(glob.glob(pattern, recursive=recursive))
+        else:
+            files.extend(glob.glob(item, recursive=recursive))
+
+    seen = set()
+    out = []
+    for f in sorted(files):
+        path = os.path.abspath(f)
+        if path not in seen and path.lower().endswith(".pdf"):
+            seen.add(path)
+            out.append(path)
+    return out
+
+
+def already_done(out_path):
+    # files analyzed in an earlier (possibly interrupted) run; a file whose record is
+    # an error (model out of memory, worker crash, bad PDF) is not done and runs again
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if not record.get("error"):
+                    done.add(record["file"])
+            except (ValueError, KeyError, AttributeError):
+                # half written line from a crash, that file just runs again
+                continue
+    return done
+
+
+def _init_worker(options):
+    # runs once per worker process: load + warm the model so every file reuses it
+    from model_registry import warm_up
+
+    _options.update(options)
+    if options.get("engine") == "bi":
+        from bi_encoder import keyword_embeddings, resolve_encoder
+        from rubric import load_rubric
+        keyword_embeddings(resolve_encoder(options.get("model")), load_rubric().sections)
+    else:
+        warm_up(options.get("model"), options.get("backend"))
+
+    if options.get("cache_path"):
+        from result_cache import ResultCache
+        _options["cache"] = ResultCache(options["cache_path"])
+
+    if options.get("score_cache_path"):
+        from score_cache import ScoreCache
+        _options["score_cache"] = ScoreCache(options["score_cache_path"])
+
+
+def _check_one(path):
+    from Syllabus_Checker_For_GUI import check_syllabus
+    from report_render import render_text
+    from metrics import AnalysisMetrics
+
+    metrics = AnalysisMetrics()
+    start = time.perf_counter()
+    try:
+        report = check_syllabus(
+            path,
+            model=_options.get("model"),
+            prefilter_k=_options.get("prefilter_k"),
+            phrase_fast_path=_options.get("phrase_fast_path", True),
+            cache=_options.get("cache"),
+            streaming=_options.get("streaming", False),
+            metrics=metrics,
+            engine=_options.get("engine", "cross"),
+            backend=_options.get("backend"),
+            score_cache=_options.get("score_cache"),
+            # files are already spread over the worker processes
+            extract_workers=1,
+        )
+        result = report.to_dict()
+        if _options.get("with_report"):
+            result["report"] = render_text(report)
+    except Exception as e:
+        result = {"error": str(e)}
+
+    record = {"file": path, "seconds": round(time.perf_counter() - start, 4)}
+    record.update(result)
+    record["metrics"] = metrics.to_dict()
+    return record
+
+
+def export_pdf(out_path, pdf_path):
+    # every successful record in the JSONL file, one report after another in a single PDF
+    from report import SyllabusReport
+    from report_render import save_reports_as_pdf
+
+    fields = set(SyllabusReport.__dataclass_fields__)
+
+    def reports():
+        with open(out_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("error") or "sections" not in record:
+                    continue
+                yield SyllabusReport.from_dict({k: v for k, v in record.items() if k in fields})
+
+    save_reports_as_pdf(reports(), pdf_path)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    # nearest-rank percentile
+    ordered = sorted(values)
+    k = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[k]
+
+
+def run_batch(files, out_path, workers=None, options=None, log=print):
+    options = options or {}
+    done = already_done(out_path)
+    todo = [f for f in files if f not in done]
+    log(f"{len(files)} PDF(s) found, {len(files) - len(todo)} already done, {len(todo)} to analyze")
+
+    latencies = []
+    failed = 0
+    start = time.perf_counter()
+
+    if todo:
+        with open(out_path, "a", encoding="utf-8") as out, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                    initargs=(options,)) as pool:
+            futures = [pool.submit(_check_one, f) for f in todo]
+            for n, fut in enumerate(as_completed(futures), start=1):
+                record = fut.result()
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+                latencies.append(record["seconds"])
+                if record.get("error"):
+                    failed += 1
+                    log(f"[{n}/{len(todo)}] ✗ {os.path.basename(record['file'])}: {record['error']}")
+                else:
+                    log(f"[{n}/{len(todo)}] ✓ {os.path.basename(record['file'])} ({record['seconds']:.2f}s)")
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "files": len(latencies),
+        "failed": failed,
+        "skipped": len(files) - len(todo),
+        "seconds": round(elapsed, 3),
+        "files_per_second": round(len(latencies) / elapsed, 3) if elapsed and latencies else 0.0,
+        "p50_seconds": percentile(latencies, 50),
+        "p95_seconds": percentile(latencies, 95),
+    }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a folder of syllabus PDFs without the GUI.")
+    parser.add_argument("inputs", nargs="+", help="folders, PDF files or glob patterns")
+    parser.add_argument("-o", "--out", default="results.jsonl", help="JSONL file to append results to")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="search folders recursively")
+    parser.add_argument("--model", default=None, help="CrossEncoder (or bi-encoder with --engine bi) name or local path")
+    parser.add_argument("--engine", choices=("cross", "bi"), default="cross",
+                        help="'bi' trades some accuracy for speed (see bi_encoder.py)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="how the CrossEncoder runs (default: $SYLLABUS_CHECKER_BACKEND or torch)")
+    parser.add_argument("--prefilter-k", type=int, default=None, help="BM25 candidates per section")
+    parser.add_argument("--no-phrase-fast-path", action="store_true", help="always use the model")
+    parser.add_argument("--streaming", action="store_true",
+                        help="score page by page and stop reading once every section is found")
+    parser.add_argument("--cache", default=None, help="result cache file shared by the workers")
+    parser.add_argument("--score-cache", default=None,
+                        help="SQLite file of (keyword, sentence) scores shared across syllabi and runs")
+    parser.add_argument("--pdf", default=None, help="also export every report in the JSONL file into one PDF")
+    parser.add_argument("--with-report", action="store_true", help="include the text report in each record")
+    parser.add_argument("--rubric", default=None, help="rubric JSON file (default: rubric.json)")
+    args = parser.parse_args(argv)
+
+    if args.rubric:
+        # through the environment so the worker processes (and the PDF export) use it too
+        from rubric import RUBRIC_ENV, load_rubric
+        os.environ[RUBRIC_ENV] = os.path.abspath(args.rubric)
+        print(f"Rubric: {load_rubric().label}")
+
+    files = find_pdfs(args.inputs, recursive=args.recursive)
+    if not files:
+        print("No PDF files found.", file=sys.stderr)
+        return 1
+
+    options = {
+        "model": args.model,
+        "engine": args.engine,
+        "backend": args.backend,
+        "prefilter_k": args.prefilter_k,
+        "phrase_fast_path": not args.no_phrase_fast_path,
+        "cache_path": args.cache,
+        "score_cache_path": args.score_cache,
+        "streaming": args.streaming,
+        "with_report": args.with_report,
+    }
+    summary = run_batch(files, args.out, workers=args.workers, options=options)
+
+    print(
+        f"\nDone: {summary['files']} file(s) in {summary['seconds']:.1f}s "
+        f"({summary['files_per_second']:.2f} files/s), "
+        f"p50 {summary['p50_seconds']:.2f}s, p95 {summary['p95_seconds']:.2f}s, "
+        f"{summary['failed']} failed, {summary['skipped']} skipped"
+    )
+
+    if args.pdf:
+        export_pdf(args.out, args.pdf)
+        print(f"Reports saved to {args.pdf}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from boilerplate import strip_repeated_lines
+from length_batching import DEFAULT_TOKEN_BUDGET, BucketedModel
+from model_registry import clear_models, get_model
+from pdf_extract import extract_pages
+from report_render import render_pdf, render_text
+from section_scoring import detect_sections
+from segmenter import segment, split_sentences
+from stub_model import StubCrossEncoder
+from Syllabus_Checker_For_GUI import REQUIRED_SECTIONS, THRESHOLD, check_syllabus, rate_readability
+
+# Reproducible performance benchmark.
+# Generates synthetic syllabus PDFs (fixed seeds) with reportlab, then times each
+# stage of the analysis separately and writes the numbers to a JSON file that
+# can be compared against an earlier run:
+#
+#   python benchmark.py --model stub -o bench.json
+#   python benchmark.py --model stub -o bench_new.json --compare bench.json
+
+# sentences that should make a section show up (one is picked per section)
+SECTION_TEXT = {
+    "Contact Information": "Instructor contact: Dr. {name}, email {name_l}@psu.edu, office hours Tuesday 2-4pm.",
+    "Course Materials": "The required texts are listed below and the course textbook is available at the bookstore.",
+    "Course Content and Expectations": "The course content covers core topics and the learning outcomes are listed below.",
+    "Location and Meeting Times": "Class meeting times are Monday and Wednesday at 10:10am in the classroom location Sutherland 101.",
+    "Course Goals and Objectives": "The course goals and course objectives are described in this section.",
+    "Grade Breakdown": "The grade breakdown and grading scale used for the final grade are shown in the table.",
+    "Examination Policy": "Exam policy: there are no makeups for exams or quizzes without documentation.",
+    "Attendance Policy": "Attendance policy: attendance is required and attendance will be taken every class.",
+    "Academic Integrity Statement": "Academic integrity is the pursuit of scholarly activity in an open, honest and responsible manner.",
+    "Counseling Services": "Counseling and psychological services are available to all students at no cost.",
+    "Disability Resources": "Student disability resources coordinates accommodations for students with disabilities.",
+    "Educational Equity Statement": "Educational equity concerns can be reported at the report bias website.",
+    "Campus Closure Policy": "In case of a campus closure or class cancellation, announcements will be posted online.",
+}
+
+FILLER_WORDS = (
+    "students will read discuss analyze write present review complete submit weekly "
+    "assignments projects chapters lectures topics research methods data theory practice "
+    "examples problems solutions the a of and to in for on with during each week module"
+).split()
+
+INSTRUCTORS = ["Smith", "Nguyen", "Garcia", "Patel", "Kim", "Okafor"]
+
+# (case name, pages, sentences per page, share of required sections present)
+CASES = [
+    ("small", 2, 12, 1.0),
+    ("medium", 8, 20, 0.75),
+    ("large", 30, 25, 0.5),
+]
+
+
+def syllabus_filename(rng, index):
+    course = rng.choice(["CMPSC", "ENGL", "MATH", "BIOL", "HIST"])
+    number = rng.choice(["101", "202", "303", "465", "83"])
+    semester = rng.choice(["FA25", "SP26", "SU25"])
+    return f"{course}_{number}_{rng.choice(INSTRUCTORS)}{index}_{semester}.pdf"
+
+
+def make_syllabus_pdf(path, pages, sentences_per_page, sections_present, seed=0):
+    # sections_present: names from REQUIRED_SECTIONS whose sentence is placed somewhere in the document
+    rng = random.Random(seed)
+    name = rng.choice(INSTRUCTORS)
+
+    body = []
+    for _ in range(pages * sentences_per_page):
+        n = rng.randint(6, 22)
+        body.append(" ".join(rng.choice(FILLER_WORDS) for _ in range(n)).capitalize() + ".")
+    for section in sections_present:
+        pos = rng.randrange(len(body))
+        body[pos] = SECTION_TEXT[section].format(name=name, name_l=name.lower())
+
+    c = canvas.Canvas(path, pagesize=letter)
+    width, height = letter
+    for p in range(pages):
+        c.setFont("Helvetica", 9)
+        c.drawString(50, height - 40, f"Course Syllabus - Dr. {name}")
+        c.drawString(width / 2, 30, f"Page {p + 1} of {pages}")
+        c.setFont("Helvetica", 10)
+        y = height - 70
+        for sentence in body[p * sentences_per_page:(p + 1) * sentences_per_page]:
+            # long sentences go over two lines like real paragraphs
+            words = sentence.split()
+            for chunk in (words[:14], words[14:]):
+                if chunk:
+                    c.drawString(50, y, " ".join(chunk))
+                    y -= 12
+            if y < 60:
+                break
+        c.showPage()
+    c.save()
+
+
+def generate_corpus(folder, cases=CASES, seed=1234):
+    # [(case name, path, pages, sentences per page, sections present)]
+    rng = random.Random(seed)
+    names = list(REQUIRED_SECTIONS)
+    corpus = []
+    for i, (case, pages, per_page, share) in enumerate(cases):
+        present = rng.sample(names, round(share * len(names)))
+        path = os.path.join(folder, syllabus_filename(rng, i))
+        make_syllabus_pdf(path, pages, per_page, present, seed=seed + i)
+        corpus.append((case, path, pages, per_page, sorted(present)))
+    return corpus
+
+
+def time_model_load(model_name):
+    # cold load of the real model (the registry keeps it afterwards)
+    if model_name == "stub":
+        return 0.0
+    clear_models()
+    start = time.perf_counter()
+    get_model(model_name)
+    return time.perf_counter() - start
+
+
+def time_stages(path, model, token_budget=DEFAULT_TOKEN_BUDGET):
+    # one run of every stage, done the same way check_syllabus does it
+    timings = {}
+    scorer = BucketedModel(model, token_budget) if token_budget else model
+
+    start = time.perf_counter()
+    reader = PdfReader(path)
+    # one process: the benchmark PDFs are below pdf_extract.PARALLEL_MIN_PAGES anyway
+    pages, _ = extract_pages(path, reader, workers=1)
+    page_texts, _ = strip_repeated_lines([text for _, text in pages])
+    sentences = split_sentences("".join(page_texts))
+    segments = segment(sentences)
+    timings["extract"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detect_sections(scorer, REQUIRED_SECTIONS, segments.texts, THRESHOLD)
+    timings["scoring"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rate_readability(sentences, 3)
+    timings["readability"] = time.perf_counter() - start
+
+    report = check_syllabus(path, model=model, token_budget=token_budget)
+    start = time.perf_counter()
+    render_text(report)
+    with tempfile.TemporaryDirectory() as tmp:
+        render_pdf(report, os.path.join(tmp, "report.pdf"))
+    timings["render"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    check_syllabus(path, model=model, token_budget=token_budget)
+    timings["total"] = time.perf_counter() - start
+
+    return timings, len(sentences), len(segments)
+
+
+def run_benchmark(model_name="stub", repeat=5, cases=CASES, seed=1234, token_budget=DEFAULT_TOKEN_BUDGET,
+                  stub_token_cost=0.0, log=print):
+    model_load = time_model_load(model_name)
+    model = StubCrossEncoder(stub_token_cost) if model_name == "stub" else get_model(model_name)
+    log(f"model load {model_load * 1000:.1f}ms")
+    results = []
+
+    with tempfile.TemporaryDirectory() as folder:
+        for case, path, pages, per_page, present in generate_corpus(folder, cases, seed):
+            # one untimed run first so caches (syllables, fonts, torch kernels) are warm
+            time_stages(path, model, token_budget)
+            runs = []
+            for _ in range(repeat):
+                if model_name == "stub":
+                    model.padded_tokens = 0
+                timings, n_sentences, n_scored = time_stages(path, model, token_budget)
+                runs.append(timings)
+
+            medians = {stage: statistics.median(r[stage] for r in runs) for stage in runs[0]}
+            results.append({
+                "case": case,
+                "file": os.path.basename(path),
+                "pages": pages,
+                "sentences_per_page": per_page,
+                "sections_present": len(present),
+                "sentences": n_sentences,
+                "scored_sentences": n_scored,
+                # padding the stub model saw in one run (deterministic, so any change is real)
+                "padded_tokens": model.padded_tokens if model_name == "stub" else None,
+                "seconds": {stage: round(v, 6) for stage, v in medians.items()},
+            })
+            log(f"{case:<8} " + "  ".join(f"{stage} {medians[stage] * 1000:8.1f}ms" for stage in medians))
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model": model_name,
+            "repeat": repeat,
+            "seed": seed,
+            "model_load_seconds": round(model_load, 6),
+            "token_budget": token_budget,
+            "stub_token_cost": stub_token_cost,
+        },
+        "cases": results,
+    }
+
+
+def compare(current, previous, tolerance=0.25, min_seconds=0.002, log=print):
+    # prints per-stage ratios against an earlier run; returns the stages that got slower
+    # (stages under min_seconds in both runs are too noisy to flag)
+    before = {c["case"]: c["seconds"] for c in previous["cases"]}
+    slower = []
+    for case in current["cases"]:
+        old = before.get(case["case"])
+        if old is None:
+            continue
+        parts = []
+        for stage, new_t in case["seconds"].items():
+            old_t = old.get(stage)
+            if not old_t:
+                continue
+            ratio = new_t / old_t
+            flag = ""
+            if ratio > 1 + tolerance and max(new_t, old_t) >= min_seconds:
+                flag = " !"
+                slower.append((case["case"], stage, ratio))
+            parts.append(f"{stage} x{ratio:.2f}{flag}")
+        log(f"{case['case']:<8} " + "  ".join(parts))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each stage of the syllabus check on synthetic PDFs.")
+    parser.add_argument("--model", default="stub", help="'stub' (offline) or a CrossEncoder name / path")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case, the median is reported")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("-o", "--out", default="bench_output.json", help="where to write the results")
+    parser.add_argument("--compare", default=None, help="earlier results file to compare against")
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_TOKEN_BUDGET,
+                        help="padded tokens per model batch (0 = document order, fixed batches)")
+    parser.add_argument("--stub-token-cost", type=float, default=0.0,
+                        help="seconds per padded token the stub model spends, to mimic a real forward pass")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="slowdown allowed before flagging")
+    args = parser.parse_args(argv)
+
+    current = run_benchmark(args.model, repeat=args.repeat, seed=args.seed,
+                            token_budget=args.token_budget or None, stub_token_cost=args.stub_token_cost)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"\nCompared with {args.compare}:")
+        slower = compare(current, previous, tolerance=args.tolerance)
+        if slower:
+            print(f"{len(slower)} stage(s) slower than the {args.tolerance:.0%} tolerance")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+from model_registry import DEFAULT_BI_ENCODER_NAME, get_bi_encoder
+from phrase_matcher import phrase_hits
+from section_scoring import keyword_rows, reduce_sections
+
+# Bi-encoder detection engine (check_syllabus(..., engine="bi")).
+# The cross-encoder runs one forward pass per (keyword, sentence) pair. Here every
+# keyword is embedded once (and kept on disk), each syllabus embeds its sentences
+# once, and all scores come from a single keywords x sentences matrix product of
+# normalized embeddings (cosine similarity). Faster, somewhat less accurate.
+#
+# Cosine scores are not probabilities, so the 0.4 cross-encoder THRESHOLD does not
+# apply; every section gets its own threshold, calibrated against the cross-encoder:
+#
+#   python bi_encoder.py calibrate syllabi/ -o ~/.syllabus_checker/bi_thresholds.json
+#   python bi_encoder.py precompute          # write the keyword embeddings ahead of time
+#
+# The keyword store and the thresholds are filed under the requested encoder name
+# or path (see encoder_name), so two encoders never read each other's vectors.
+
+DEFAULT_BI_THRESHOLD = 0.5
+ENCODE_BATCH_SIZE = 64
+
+_keyword_cache = {}
+_lock = threading.Lock()
+
+
+def data_dir():
+    return os.path.join(os.path.expanduser("~"), ".syllabus_checker")
+
+
+def default_thresholds_path():
+    return os.path.join(data_dir(), "bi_thresholds.json")
+
+
+def encoder_name(encoder=None):
+    # the requested model name / path. An encoder object only has one if it came from
+    # resolve_encoder (the name is recorded on it, wrappers pass the attribute through);
+    # anything else is None: its keywords are embedded on every call and nothing is stored
+    if encoder is None or isinstance(encoder, str):
+        return encoder or DEFAULT_BI_ENCODER_NAME
+    return getattr(encoder, "bi_encoder_name", None)
+
+
+def resolve_encoder(encoder=None):
+    if encoder is None or isinstance(encoder, str):
+        name = encoder_name(encoder)
+        model = get_bi_encoder(name)
+        model.bi_encoder_name = name
+        return model
+    return encoder
+
+
+def embed(encoder, texts, batch_size=ENCODE_BATCH_SIZE):
+    # unit-length rows, so a dot product is the cosine similarity
+    vectors = encoder.encode(list(texts), batch_size=batch_size, show_progress_bar=False,
+                             convert_to_numpy=True, normalize_embeddings=True)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _store_path(name, folder=None):
+    digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:24]
+    return os.path.join(folder or os.path.join(data_dir(), "embeddings"), f"keywords_{digest}.npz")
+
+
+def _load_store(path):
+    # {keyword: vector} saved for one model; a missing or corrupt file is just empty
+    try:
+        with np.load(path) as data:
+            return dict(zip(data["keywords"].tolist(), data["vectors"]))
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def keyword_embeddings(encoder, required_sections, folder=None, name=None):
+    # (embeddings, rows) for the keywords of these sections. Every keyword is embedded
+    # once per model and kept in ~/.syllabus_checker/embeddings, so any subset of the
+    # rubric (streaming scores only the sections still missing) is a lookup.
+    # name: what the store is filed under (default: encoder_name(encoder))
+    rows = keyword_rows(required_sections)
+    name = name or encoder_name(encoder)
+    path = _store_path(name, folder) if name else None
+
+    with _lock:
+        if path is None:
+            store = {}
+        else:
+            store = _keyword_cache.get(path)
+            if store is None:
+                store = _keyword_cache[path] = _load_store(path)
+
+        missing = sorted({kw.lower() for _, kw in rows} - store.keys())
+        if missing:
+            store.update(zip(missing, embed(encoder, missing)))
+        if missing and path is not None:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    np.savez(f, keywords=np.array(list(store)), vectors=np.stack(list(store.values())))
+                os.replace(tmp, path)
+            except OSError:
+                pass  # read-only home etc., the in-memory copy still works
+
+        matrix = np.stack([store[kw.lower()] for _, kw in rows]) if rows else np.zeros((0, 0), dtype=np.float32)
+    return matrix, rows
+
+
+def _read_thresholds(path):
+    # {encoder name: {section: threshold}}; a file from before thresholds were kept per
+    # encoder ({section: threshold}) was calibrated for the default encoder
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if data and all(isinstance(v, (int, float)) for v in data.values()):
+        return {DEFAULT_BI_ENCODER_NAME: data}
+    return {k: v for k, v in data.items() if isinstance(v, dict)}
+
+
+def load_thresholds(path=None, name=None):
+    # {section: cosine threshold} calibrated for this encoder (default: the default encoder);
+    # missing file, unknown or unnamed encoder -> {} (DEFAULT_BI_THRESHOLD everywhere)
+    saved = _read_thresholds(path or default_thresholds_path()).get(name or DEFAULT_BI_ENCODER_NAME, {})
+    try:
+        return {k: float(v) for k, v in saved.items()}
+    except (TypeError, ValueError):
+        return {}
+
+
+def save_thresholds(thresholds, name, path=None):
+    # replaces this encoder's entry, keeps the others
+    path = path or default_thresholds_path()
+    data = _read_thresholds(path)
+    data[name] = thresholds
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def section_similarities(encoder, required_sections, sentences, name=None):
+    # matrix[i, j] is the cosine similarity of sentence j and rows[i] = (section, keyword)
+    keywords, rows = keyword_embeddings(encoder, required_sections, name=name)
+    if not sentences:
+        return np.zeros((len(rows), 0)), rows
+    vectors = embed(encoder, [s.lower() for s in sentences])
+    return keywords @ vectors.T, rows
+
+
+def bi_detect_sections(encoder, required_sections, sentences, threshold=None, batch_size=None,
+                       prefilter_k=None, phrase_fast_path=False, name=None):
+    # same call and result shape as section_scoring.detect_sections, so it can be
+    # swapped in (also inside page_pipeline.stream_sections).
+    # threshold: {section: cosine threshold}, a single number, or None for the saved thresholds
+    # name: encoder name for the keyword store / thresholds (default: encoder_name(encoder))
+    # batch_size / prefilter_k are accepted for compatibility; one matrix product needs neither
+    name = name or encoder_name(encoder)
+    if threshold is None:
+        threshold = load_thresholds(name=name) if name else {}
+
+    def cutoff(section):
+        if isinstance(threshold, dict):
+            return threshold.get(section, DEFAULT_BI_THRESHOLD)
+        return threshold
+
+    hits = phrase_hits(required_sections, sentences) if phrase_fast_path else {}
+
+    scored = {}
+    if len(hits) < len(required_sections):
+        remaining = {sec: kws for sec, kws in required_sections.items() if sec not in hits}
+        matrix, rows = section_similarities(encoder, remaining, sentences, name)
+        scored = reduce_sections(matrix, rows, sentences, float("inf"))
+        if sentences:
+            for section, r in scored.items():
+                r["found"] = r["score"] >= cutoff(section)
+
+    results = {}
+    for section in required_sections:
+        if section in hits:
+            results[section] = {"found": True, "score": None, "sentence": sentences[hits[section]],
+                                "matched_by": "phrase"}
+        else:
+            results[section] = scored[section]
+    return results
+
+
+def calibrate_thresholds(best_scores, labels, default=DEFAULT_BI_THRESHOLD):
+    # best_scores: [{section: best cosine score in that document}]
+    # labels:      [set of sections really present in that document]
+    # picks, per section, the cutoff with the best F1 (midpoint between neighbouring scores)
+    sections = sorted({s for doc in best_scores for s in doc})
+    thresholds = {}
+    for section in sections:
+        points = sorted((doc.get(section, 0.0), section in found) for doc, found in zip(best_scores, labels))
+        positives = sum(p for _, p in points)
+        if positives == 0 or positives == len(points):
+            thresholds[section] = default
+            continue
+
+        best_f1, best_cut = -1.0, default
+        for k in range(1, len(points)):
+            # everything from k up is predicted present
+            if points[k][0] == points[k - 1][0]:
+                continue
+            tp = sum(p for _, p in points[k:])
+            predicted = len(points) - k
+            f1 = 2 * tp / (predicted + positives)
+            if f1 > best_f1:
+                best_f1, best_cut = f1, (points[k][0] + points[k - 1][0]) / 2
+        thresholds[section] = round(float(best_cut), 4)
+    return thresholds
+
+
+def _calibrate(files, encoder_name_or_path, cross_model, out_path, log=print):
+    # labels come from the cross-encoder, the bi-encoder thresholds are fit to agree with it
+    from pypdf import PdfReader
+
+    from Syllabus_Checker_For_GUI import check_syllabus
+    from page_pipeline import iter_page_texts
+    from report import SyllabusReport
+    from rubric import load_rubric
+    from segmenter import segment, split_sentences
+
+    encoder = resolve_encoder(encoder_name_or_path)
+    name = encoder_name(encoder_name_or_path)
+    sections = load_rubric().sections
+    best_scores, labels = [], []
+    for path in files:
+        try:
+            report = check_syllabus(path, model=cross_model, phrase_fast_path=False)
+        except ValueError as e:
+            report = SyllabusReport(error=str(e))
+        if report.error:
+            log(f"skipped {os.path.basename(path)}: {report.error}")
+            continue
+        text = "".join(t for _, t in iter_page_texts(PdfReader(path)))
+        sentences = segment(split_sentences(text)).texts
+        results = bi_detect_sections(encoder, sections, sentences, threshold=0.0)
+        best_scores.append({s: r["score"] for s, r in results.items()})
+        labels.append(set(report.found))
+        log(f"{os.path.basename(path)}: {len(report.found)} section(s) found by the cross-encoder")
+
+    thresholds = calibrate_thresholds(best_scores, labels)
+    save_thresholds(thresholds, name, out_path)
+    return thresholds
+
+
+def main(argv=None):
+    from batch_check import find_pdfs
+    from rubric import load_rubric
+
+    parser = argparse.ArgumentParser(description="Keyword embeddings and thresholds for the bi-encoder engine.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pre = sub.add_parser("precompute", help="embed the rubric keywords and store them on disk")
+    pre.add_argument("--encoder", default=None, help="sentence-transformers model name or local path")
+
+    cal = sub.add_parser("calibrate", help="fit per-section thresholds against the cross-encoder")
+    cal.add_argument("inputs", nargs="+", help="folders, PDF files or glob patterns")
+    cal.add_argument("--encoder", default=None, help="sentence-transformers model name or local path")
+    cal.add_argument("--model", default=None, help="CrossEncoder used for the labels")
+    cal.add_argument("-o", "--out", default=default_thresholds_path(), help="where to write the thresholds")
+    args = parser.parse_args(argv)
+
+    if args.command == "precompute":
+        matrix, rows = keyword_embeddings(resolve_encoder(args.encoder), load_rubric().sections)
+        print(f"{len(rows)} keyword embeddings of size {matrix.shape[1]} ready")
+        return 0
+
+    files = find_pdfs(args.inputs)
+    if not files:
+        print("No PDF files found.", file=sys.stderr)
+        return 1
+    thresholds = _calibrate(files, args.encoder, args.model, args.out)
+    for section, t in thresholds.items():
+        print(f"{section:<32} {t:.3f}")
+    print(f"Thresholds written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
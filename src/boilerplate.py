@@ -0,0 +1,72 @@
+import re
+
+# Repeated page headers / footers (course title, instructor name, page numbers,
+# university boilerplate) are found by looking at the first and last few lines
+# of every page and removed before the text is split into sentences. The first
+# copy of each repeated line is kept, so text that only appears in a header (the
+# instructor's contact line, say) is still seen once by the model.
+
+DIGITS = re.compile(r"\d+")
+
+EDGE_LINES = 3       # lines looked at on the top and bottom of each page
+MIN_PAGES = 3        # never strip anything from documents shorter than this
+MIN_FRACTION = 0.5   # a line has to repeat on at least this share of the pages
+SHORT_LINE_WORDS = 5
+MIN_PAGE_LINES = 2 * EDGE_LINES + 2   # shorter pages are all "edge", leave them alone
+
+
+def line_key(line):
+    # "Page 3 of 12" and "Page 4 of 12" should count as the same line; only short
+    # lines get their numbers masked so numbered content lines stay distinct
+    words = line.lower().split()
+    key = " ".join(words)
+    return DIGITS.sub("#", key) if len(words) <= SHORT_LINE_WORDS else key
+
+
+def _edge_indices(lines, edge_lines):
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    if len(filled) < max(MIN_PAGE_LINES, 2 * edge_lines + 2):
+        return set()
+    return set(filled[:edge_lines] + filled[-edge_lines:])
+
+
+def repeated_lines(page_texts, edge_lines=EDGE_LINES, min_pages=MIN_PAGES, min_fraction=MIN_FRACTION):
+    # keys of header / footer lines that show up on most pages
+    if len(page_texts) < min_pages:
+        return set()
+
+    counts = {}
+    for text in page_texts:
+        lines = text.split("\n")
+        keys = {line_key(lines[i]) for i in _edge_indices(lines, edge_lines)}
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+
+    needed = max(min_pages, min_fraction * len(page_texts))
+    return {key for key, n in counts.items() if n >= needed}
+
+
+def strip_repeated_lines(page_texts, **kwargs):
+    # returns (cleaned page texts, number of lines removed)
+    repeated = repeated_lines(page_texts, **kwargs)
+    if not repeated:
+        return list(page_texts), 0
+
+    edge_lines = kwargs.get("edge_lines", EDGE_LINES)
+    cleaned = []
+    removed = 0
+    seen = set()
+    for text in page_texts:
+        lines = text.split("\n")
+        edges = _edge_indices(lines, edge_lines)
+        kept = []
+        for i, line in enumerate(lines):
+            key = line_key(line)
+            if i in edges and key in repeated and key in seen:
+                removed += 1
+            else:
+                if i in edges and key in repeated:
+                    seen.add(key)
+                kept.append(line)
+        cleaned.append("\n".join(kept))
+    return cleaned, removed
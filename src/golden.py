@@ -0,0 +1,355 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from result_cache import file_digest
+
+# Golden-output regression harness for the section detection.
+# Every speedup (batching, pruning, caching, another backend) risks silently
+# changing which sections are marked found. "record" runs a fixed corpus
+# through the plain reference path of check_syllabus (every sentence as split,
+# every pair scored, no shortcuts) and saves each section's decision and best
+# score; "compare" runs the corpus through each optimized mode and reports every
+# disagreement with the golden file, next to how much faster the mode is than
+# the reference.
+#
+#   python golden.py record syllabi/ -o golden.json
+#   python golden.py compare syllabi/ --golden golden.json
+#
+# Without real syllabi, a synthetic corpus (benchmark.py's generator, fixed seed)
+# can be used; compare recreates it from the seed stored in the golden file:
+#
+#   python golden.py record --generated --model stub -o golden_stub.json
+#   python golden.py compare --golden golden_stub.json --model stub
+#
+# found / not found has to match exactly. Scores may differ by --tolerance.
+# Modes that score every pair must land within the tolerance on both sides;
+# modes that skip work (phrase matches, BM25 prefilter, stopping once a section
+# is found) may miss the best sentence, so only a score *above* the reference
+# (which already took the maximum over everything) counts against them.
+
+REFERENCE = {
+    "segmented": False,
+    "phrase_fast_path": False,
+    "prefilter_k": None,
+    "streaming": False,
+    "strip_boilerplate": False,
+    "token_budget": None,
+    "extract_workers": 1,
+    "backend": "torch",
+}
+
+DEFAULT_TOLERANCE = 0.05
+DEFAULT_PREFILTER_K = 25
+
+# name -> (check_syllabus options on top of REFERENCE, scores every pair)
+# (streaming always segments, so it also includes what "segmented" changes)
+MODES = {
+    "reference": ({}, True),
+    # de-duplicated sentences, long chunks scored as overlapping windows
+    "segmented": ({"segmented": True}, True),
+    "token_budget": ({"token_budget": 16384}, True),
+    "parallel_extract": ({"extract_workers": None}, True),
+    "score_cache": ({}, True),
+    "micro_batch": ({}, True),
+    "phrase_fast_path": ({"phrase_fast_path": True}, False),
+    "prefilter": ({"prefilter_k": DEFAULT_PREFILTER_K}, False),
+    "streaming": ({"streaming": True}, False),
+    "strip_boilerplate": ({"strip_boilerplate": True}, False),
+    # what check_syllabus does when called without options
+    "default": ({"segmented": True, "phrase_fast_path": True, "strip_boilerplate": True,
+                 "token_budget": 16384, "extract_workers": None}, False),
+    "int8": ({"backend": "int8"}, True),
+    "onnx": ({"backend": "onnx"}, True),
+}
+DEFAULT_MODES = ["reference", "segmented", "token_budget", "parallel_extract", "score_cache", "micro_batch",
+                 "phrase_fast_path", "prefilter", "streaming", "strip_boilerplate", "default"]
+
+# pages, sentences per page, share of required sections present; one file is long
+# enough (>= pdf_extract.PARALLEL_MIN_PAGES) to take the parallel extraction path
+GENERATED_CASES = [
+    ("all_sections", 2, 12, 1.0),
+    ("most_sections", 6, 20, 0.75),
+    ("half_sections", 12, 25, 0.5),
+    ("few_sections", 4, 18, 0.25),
+    ("no_sections", 3, 15, 0.0),
+    ("long", 45, 20, 0.6),
+]
+
+
+def load_model(name):
+    if name == "stub":
+        from stub_model import StubCrossEncoder
+        return StubCrossEncoder()
+    from model_registry import get_model
+    return get_model(name, REFERENCE["backend"])
+
+
+def _mode_args(mode, model, model_arg, folder):
+    # check_syllabus keyword arguments for one mode; None if it cannot run here
+    options, _ = MODES[mode]
+    args = dict(REFERENCE, **options)
+    args["model"] = model
+    if mode in ("int8", "onnx"):
+        if not isinstance(model_arg, str) or model_arg == "stub":
+            return None
+        # a model name, so the registry loads it with the other backend
+        args["model"] = model_arg
+    elif mode == "score_cache":
+        from score_cache import ScoreCache
+        args["score_cache"] = ScoreCache(os.path.join(folder, "scores.sqlite"))
+    elif mode == "micro_batch":
+        from micro_batcher import MicroBatcher
+        args["model"] = MicroBatcher(model)
+    return args
+
+
+def run_check(path, args, repeat=1):
+    # (report, median seconds)
+    from Syllabus_Checker_For_GUI import check_syllabus
+
+    times = []
+    report = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        report = check_syllabus(path, **args)
+        times.append(time.perf_counter() - start)
+    return report, statistics.median(times)
+
+
+def decisions(report):
+    # score is None for sections decided by a verbatim phrase match (no model score)
+    return {s.name: {"found": s.found, "score": None if s.score is None else round(float(s.score), 6),
+                     "matched_by": s.matched_by}
+            for s in report.sections}
+
+
+def _score_text(score):
+    return "phrase match" if score is None else f"{score:.4f}"
+
+
+def corpus_files(inputs, generated, folder, seed):
+    # [(key, path)]; the key identifies the file in the golden file
+    if generated:
+        from benchmark import generate_corpus
+        return [(case, path) for case, path, *_ in generate_corpus(folder, GENERATED_CASES, seed)]
+
+    from batch_check import find_pdfs
+    files = find_pdfs(inputs)
+    keys = [os.path.basename(p) for p in files]
+    if len(set(keys)) != len(keys):
+        # same file name in several folders: keep the paths apart
+        keys = [os.path.relpath(p) for p in files]
+    return list(zip(keys, files))
+
+
+def record(files, model, model_arg, out_path, generated=False, seed=1234, log=print):
+    from model_registry import model_name
+    from rubric import load_rubric
+
+    golden = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "model": model_name(model, REFERENCE["backend"]),
+            "model_arg": model_arg,
+            "rubric": load_rubric().digest,
+            "reference": REFERENCE,
+            "generated": generated,
+            "seed": seed,
+        },
+        "files": {},
+    }
+    for key, path in files:
+        try:
+            report, seconds = run_check(path, _mode_args("reference", model, model_arg, None))
+        except ValueError as e:
+            log(f"skipped {key}: {e}")
+            continue
+        if report.error:
+            log(f"skipped {key}: {report.error}")
+            continue
+        golden["files"][key] = {
+            "sha256": file_digest(path),
+            "seconds": round(seconds, 4),
+            "sections": decisions(report),
+        }
+        log(f"{key}: {len(report.found)}/{len(report.sections)} section(s) found")
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=2)
+    return golden
+
+
+def disagreements(golden_sections, report, exhaustive, tolerance):
+    # [(section, golden found, golden score, found, score, kind)] with kind "decision" or "score"
+    out = []
+    got = decisions(report)
+    for section, want in golden_sections.items():
+        have = got.get(section)
+        if have is None:
+            out.append((section, want["found"], want["score"], None, None, "decision"))
+            continue
+        if have["found"] != want["found"]:
+            out.append((section, want["found"], want["score"], have["found"], have["score"], "decision"))
+            continue
+        if have["matched_by"] == "phrase":
+            # a verbatim phrase match, there is no model score to compare
+            continue
+        diff = have["score"] - want["score"]
+        if diff > tolerance or (exhaustive and -diff > tolerance):
+            out.append((section, want["found"], want["score"], have["found"], have["score"], "score"))
+    return out
+
+
+def compare(golden, files, model, model_arg, modes, tolerance=DEFAULT_TOLERANCE, repeat=1, log=print):
+    # returns {mode: {"files", "decisions", "scores", "max_score_diff", "seconds", "reference_seconds",
+    #                 "speedup", "disagreements": [...]}}; the reference is re-timed here so the
+    #                 speedups come from the same machine and the same run
+    from model_registry import model_name
+
+    name = model_name(model, REFERENCE["backend"])
+    if golden["meta"]["model"] != name:
+        raise ValueError(f"Golden file was recorded with {golden['meta']['model']}, not {name}.")
+
+    known = []
+    for key, path in files:
+        entry = golden["files"].get(key)
+        if entry is None:
+            log(f"no golden output for {key}, skipped")
+        elif not golden["meta"].get("generated") and file_digest(path) != entry["sha256"]:
+            # generated PDFs carry a creation date, real ones must be byte-identical
+            log(f"{key} changed since the golden file was recorded, skipped")
+        else:
+            known.append((key, path, entry))
+
+    with tempfile.TemporaryDirectory(prefix="golden_") as folder:
+        reference_seconds = {}
+        if known:
+            # one untimed run first so the model, fonts and syllable caches are warm
+            run_check(known[0][1], _mode_args("reference", model, model_arg, folder))
+        for key, path, _ in known:
+            _, reference_seconds[key] = run_check(path, _mode_args("reference", model, model_arg, folder), repeat)
+
+        results = {}
+        for mode in modes:
+            args = _mode_args(mode, model, model_arg, folder)
+            if args is None:
+                log(f"{mode:<18} skipped (needs a model name, not {model_arg or 'a model object'})")
+                continue
+            exhaustive = MODES[mode][1]
+            summary = {"files": 0, "decisions": 0, "scores": 0, "max_score_diff": 0.0,
+                       "seconds": 0.0, "reference_seconds": 0.0, "disagreements": []}
+            try:
+                for key, path, entry in known:
+                    report, seconds = run_check(path, args, repeat)
+                    summary["files"] += 1
+                    summary["seconds"] += seconds
+                    summary["reference_seconds"] += reference_seconds[key]
+                    if report.error:
+                        summary["decisions"] += len(entry["sections"])
+                        summary["disagreements"].append((key, None, None, None, None, None, report.error))
+                        continue
+                    for section, want_found, want_score, found, score, kind in disagreements(
+                            entry["sections"], report, exhaustive, tolerance):
+                        summary["decisions" if kind == "decision" else "scores"] += 1
+                        summary["disagreements"].append((key, section, want_found, want_score, found, score, kind))
+                    for s in report.sections:
+                        want = entry["sections"].get(s.name)
+                        if want is not None and s.matched_by == "model":
+                            summary["max_score_diff"] = max(summary["max_score_diff"],
+                                                            abs(float(s.score) - want["score"]))
+            except Exception as e:
+                log(f"{mode:<18} failed: {e}")
+                continue
+            finally:
+                if "score_cache" in args:
+                    args["score_cache"].close()
+                if mode == "micro_batch":
+                    args["model"].close()
+
+            summary["speedup"] = summary["reference_seconds"] / summary["seconds"] if summary["seconds"] else 0.0
+            results[mode] = summary
+            log(f"{mode:<18} x{summary['speedup']:5.2f}  {summary['seconds']:7.2f}s  "
+                f"{summary['decisions']} decision(s) differ, {summary['scores']} score(s) off, "
+                f"max |score diff| {summary['max_score_diff']:.4f}")
+            for key, section, want_found, want_score, found, score, kind in summary["disagreements"]:
+                if section is None:
+                    log(f"    {key}: {kind}")
+                elif found is None:
+                    log(f"    {key} / {section}: not in the {mode} report [{kind}]")
+                else:
+                    log(f"    {key} / {section}: golden {'found' if want_found else 'not found'} "
+                        f"({_score_text(want_score)}), {mode} {'found' if found else 'not found'} "
+                        f"({_score_text(score)}) [{kind}]")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check optimized detection modes against golden reference output.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="run the reference path and save the golden output")
+    cmp_ = sub.add_parser("compare", help="run each mode and report where it disagrees with the golden output")
+    for p in (rec, cmp_):
+        p.add_argument("inputs", nargs="*", help="folders, PDF files or glob patterns")
+        p.add_argument("--model", default=None, help="'stub' (offline) or a CrossEncoder name / path")
+    rec.add_argument("--generated", action="store_true", help="use a synthetic corpus instead of inputs")
+    rec.add_argument("--seed", type=int, default=1234, help="seed for --generated")
+    rec.add_argument("-o", "--out", default="golden.json", help="where to write the golden output")
+    cmp_.add_argument("--golden", default="golden.json", help="golden file written by 'record'")
+    cmp_.add_argument("--modes", default=",".join(DEFAULT_MODES),
+                      help=f"comma-separated, from: {', '.join(MODES)}")
+    cmp_.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed score difference")
+    cmp_.add_argument("--repeat", type=int, default=1, help="runs per file and mode, the median is timed")
+    cmp_.add_argument("-o", "--out", default=None, help="also write the comparison as JSON")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="golden_corpus_") as folder:
+        if args.command == "record":
+            if not args.inputs and not args.generated:
+                parser.error("give PDF inputs or --generated")
+            files = corpus_files(args.inputs, args.generated, folder, args.seed)
+            if not files:
+                print("No PDF files found.", file=sys.stderr)
+                return 1
+            golden = record(files, load_model(args.model), args.model, args.out,
+                            generated=args.generated, seed=args.seed)
+            print(f"Golden output for {len(golden['files'])} file(s) written to {args.out}")
+            return 0
+
+        with open(args.golden, encoding="utf-8") as f:
+            golden = json.load(f)
+        modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+        unknown = [m for m in modes if m not in MODES]
+        if unknown:
+            parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+        from rubric import load_rubric
+        if golden["meta"]["rubric"] != load_rubric().digest:
+            print("Warning: the rubric changed since the golden file was recorded.", file=sys.stderr)
+
+        generated = golden["meta"].get("generated", False)
+        files = corpus_files(args.inputs, generated, folder, golden["meta"].get("seed", 1234))
+        try:
+            results = compare(golden, files, load_model(args.model), args.model, modes,
+                              tolerance=args.tolerance, repeat=args.repeat)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    failing = [m for m, r in results.items() if r["decisions"] or r["scores"]]
+    print(f"{len(failing)} of {len(results)} mode(s) disagree with the golden output"
+          + (f": {', '.join(failing)}" if failing else ""))
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
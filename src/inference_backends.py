@@ -0,0 +1,202 @@
+import argparse
+import hashlib
+import os
+import sys
+import threading
+
+import numpy as np
+
+# Inference backends for the CrossEncoder.
+#
+#   torch   sentence_transformers.CrossEncoder as before
+#   int8    the same model with its Linear layers dynamically quantized to int8
+#   onnx    the model exported once to ONNX (kept in ~/.syllabus_checker/onnx)
+#           and run with onnxruntime on the CPU
+#
+# All three have the same predict(pairs, batch_size=..., show_progress_bar=...)
+# and return what CrossEncoder.predict returns (for the ms-marco models the raw
+# logit, section_scoring applies the sigmoid), so section_scoring does not know
+# which one it is talking to. Pick one with
+# check_syllabus(..., backend="onnx"), --backend on the command line tools or
+# the SYLLABUS_CHECKER_BACKEND environment variable.
+#
+# Before switching a server over, check that the decisions do not change:
+#
+#   python inference_backends.py parity syllabi/ --backend onnx
+
+BACKENDS = ("torch", "int8", "onnx")
+DEFAULT_BACKEND = "torch"
+BACKEND_ENV = "SYLLABUS_CHECKER_BACKEND"
+ONNX_OPSET = 14
+
+_export_lock = threading.Lock()
+
+
+def default_backend():
+    return os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND
+
+
+def check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of: {', '.join(BACKENDS)}.")
+    return backend
+
+
+def load_cross_encoder(name_or_path, backend=DEFAULT_BACKEND):
+    check_backend(backend)
+    if backend == "onnx":
+        return OnnxCrossEncoder(name_or_path)
+
+    from sentence_transformers import CrossEncoder
+    model = CrossEncoder(name_or_path)
+    if backend == "int8":
+        import torch
+        model.model = torch.quantization.quantize_dynamic(model.model, {torch.nn.Linear}, dtype=torch.qint8)
+    model.backend = backend
+    return model
+
+
+def onnx_path(name_or_path):
+    digest = hashlib.sha256(name_or_path.encode("utf-8")).hexdigest()[:16]
+    safe = name_or_path.replace("/", "_").replace("\\", "_").strip("._")[-60:]
+    return os.path.join(os.path.expanduser("~"), ".syllabus_checker", "onnx", f"{safe}_{digest}.onnx")
+
+
+def export_onnx(name_or_path, path):
+    # one-off export with torch; later runs only need onnxruntime + the tokenizer
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(name_or_path)
+    model = AutoModelForSequenceClassification.from_pretrained(name_or_path).eval()
+    dummy = tokenizer("warm up", "warm up the model.", return_tensors="pt")
+    input_names = [k for k in ("input_ids", "attention_mask", "token_type_ids") if k in dummy]
+    dynamic = {k: {0: "batch", 1: "sequence"} for k in input_names}
+    dynamic["logits"] = {0: "batch"}
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with torch.no_grad():
+        torch.onnx.export(model, tuple(dummy[k] for k in input_names), tmp,
+                          input_names=input_names, output_names=["logits"],
+                          dynamic_axes=dynamic, opset_version=ONNX_OPSET)
+    os.replace(tmp, path)
+
+
+def activation_name(config):
+    # the activation sentence-transformers' CrossEncoder would pick for this model:
+    # the one saved in the config, else Sigmoid for a single label, else Identity
+    saved = getattr(config, "sbert_ce_default_activation_function", None)
+    if saved is None:
+        return "Sigmoid" if config.num_labels == 1 else "Identity"
+    name = saved.rsplit(".", 1)[-1]
+    if name not in ("Identity", "Sigmoid"):
+        raise ValueError(f"Activation {saved} is not supported by the onnx backend.")
+    return name
+
+
+class OnnxCrossEncoder:
+    # drop-in for CrossEncoder.predict backed by an onnxruntime session
+
+    backend = "onnx"
+
+    def __init__(self, name_or_path, path=None, max_length=512):
+        import onnxruntime
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.config = AutoConfig.from_pretrained(name_or_path)
+        self.tokenizer = AutoTokenizer.from_pretrained(name_or_path)
+        self.max_length = min(max_length, self.tokenizer.model_max_length)
+
+        self.path = path or onnx_path(name_or_path)
+        with _export_lock:
+            if not os.path.exists(self.path):
+                export_onnx(name_or_path, self.path)
+        self.session = onnxruntime.InferenceSession(self.path, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.activation = activation_name(self.config)
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False, **kwargs):
+        pairs = list(pairs)
+        if not pairs:
+            return np.empty(0, dtype=np.float32)
+
+        out = []
+        for start in range(0, len(pairs), batch_size):
+            chunk = pairs[start:start + batch_size]
+            encoded = self.tokenizer([a for a, _ in chunk], [b for _, b in chunk], padding=True,
+                                     truncation="longest_first", max_length=self.max_length,
+                                     return_tensors="np")
+            feed = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            out.append(self.session.run(["logits"], feed)[0])
+        logits = np.concatenate(out).astype(np.float32)
+        if logits.shape[1] == 1:
+            logits = logits[:, 0]
+
+        # same activation CrossEncoder.predict applies (Identity for the ms-marco models)
+        if self.activation == "Sigmoid":
+            return 1 / (1 + np.exp(-logits))
+        return logits
+
+
+def parity_mismatches(files, backend, reference=DEFAULT_BACKEND, model=None, log=print):
+    # runs every file through both backends (model only, no phrase shortcut) and
+    # returns [(file, section, reference found, backend found)] where the decision differs
+    from Syllabus_Checker_For_GUI import check_syllabus
+
+    mismatches = []
+    worst = 0.0
+    for path in files:
+        try:
+            ref = check_syllabus(path, model=model, backend=reference, phrase_fast_path=False)
+            new = check_syllabus(path, model=model, backend=backend, phrase_fast_path=False)
+        except ValueError as e:
+            log(f"skipped {os.path.basename(path)}: {e}")
+            continue
+        if ref.error or new.error:
+            log(f"skipped {os.path.basename(path)}: {ref.error or new.error}")
+            continue
+
+        diffs = 0
+        for a, b in zip(ref.sections, new.sections):
+            worst = max(worst, abs(a.score - b.score))
+            if a.found != b.found:
+                mismatches.append((path, a.name, a.found, b.found))
+                diffs += 1
+        log(f"{os.path.basename(path)}: {'ok' if not diffs else f'{diffs} decision(s) differ'}")
+
+    log(f"largest score difference: {worst:.4f}")
+    return mismatches
+
+
+def main(argv=None):
+    from batch_check import find_pdfs
+
+    parser = argparse.ArgumentParser(description="Check a faster inference backend against the current one.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    parity = sub.add_parser("parity", help="compare found / not found decisions on a set of syllabi")
+    parity.add_argument("inputs", nargs="+", help="folders, PDF files or glob patterns")
+    parity.add_argument("--backend", default="onnx", choices=BACKENDS, help="backend to check")
+    parity.add_argument("--reference", default=DEFAULT_BACKEND, choices=BACKENDS, help="backend to compare with")
+    parity.add_argument("--model", default=None, help="CrossEncoder name or local path")
+    parity.add_argument("-r", "--recursive", action="store_true", help="search folders recursively")
+    args = parser.parse_args(argv)
+
+    files = find_pdfs(args.inputs, recursive=args.recursive)
+    if not files:
+        print("No PDF files found.", file=sys.stderr)
+        return 1
+
+    try:
+        mismatches = parity_mismatches(files, args.backend, args.reference, model=args.model)
+    except ImportError as e:
+        print(f"Cannot run the {args.backend} backend here: {e}", file=sys.stderr)
+        return 1
+    for path, section, ref_found, new_found in mismatches:
+        print(f"  {os.path.basename(path)} / {section}: {args.reference}={ref_found} {args.backend}={new_found}")
+    print(f"{len(mismatches)} decision(s) differ across {len(files)} file(s)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import numpy as np
+
+# Length-bucketed batching for model.predict.
+# Pairs come out of section_scoring in document order, so a short "Email:" line
+# ends up padded to the length of a 200-token policy paragraph in the same
+# batch. BucketedModel sorts the pairs of each predict() call by (estimated)
+# token length, cuts them into batches that stay under a token budget
+# (batch size x longest pair in the batch), and puts the scores back in the
+# original order. Short pairs then go in large batches, long ones in small.
+
+DEFAULT_TOKEN_BUDGET = 16384   # padded tokens per forward pass (e.g. 128 pairs x 128 tokens)
+DEFAULT_MAX_BATCH = 512
+MAX_TOKENS = 512               # the cross-encoder truncates pairs to this
+CHARS_PER_TOKEN = 4            # rough wordpiece rate for English text
+SPECIAL_TOKENS = 3             # [CLS] keyword [SEP] sentence [SEP]
+
+
+def estimate_tokens(pairs):
+    # cheap stand-in for running the tokenizer twice
+    lengths = np.fromiter((len(a) + len(b) for a, b in pairs), dtype=np.int64, count=len(pairs))
+    return np.minimum(lengths // CHARS_PER_TOKEN + SPECIAL_TOKENS, MAX_TOKENS)
+
+
+def length_batches(lengths, token_budget=DEFAULT_TOKEN_BUDGET, max_batch=DEFAULT_MAX_BATCH):
+    # returns a list of index arrays, shortest pairs first; each batch keeps
+    # len(batch) * longest pair <= token_budget (a single very long pair still gets its own batch)
+    order = np.argsort(lengths, kind="stable")
+    batches = []
+    start = 0
+    while start < len(order):
+        end = start + 1
+        while end < len(order) and end - start < max_batch \
+                and (end - start + 1) * lengths[order[end]] <= token_budget:
+            end += 1
+        batches.append(order[start:end])
+        start = end
+    return batches
+
+
+class BucketedModel:
+    # model wrapper doing the above; also the place where progress is reported and
+    # cancellation noticed between batches (see progress.py), and where padded vs
+    # real token counts go into the metrics
+
+    def __init__(self, model, token_budget=DEFAULT_TOKEN_BUDGET, max_batch=DEFAULT_MAX_BATCH,
+                 progress=None, cancel=None, metrics=None):
+        self.model = model
+        self.token_budget = token_budget
+        self.max_batch = max_batch
+        self.progress = progress
+        self.cancel = cancel
+        self.metrics = metrics
+
+    def predict(self, pairs, batch_size=None, show_progress_bar=False, **kwargs):
+        pairs = list(pairs)
+        scores = np.empty(len(pairs), dtype=np.float32)
+        if not pairs:
+            return scores
+
+        lengths = estimate_tokens(pairs)
+        done = 0
+        for idx in length_batches(lengths, self.token_budget, self.max_batch):
+            if self.cancel is not None:
+                self.cancel.check()
+            batch = [pairs[i] for i in idx]
+            scores[idx] = np.asarray(
+                self.model.predict(batch, batch_size=len(batch), show_progress_bar=False, **kwargs),
+                dtype=np.float32,
+            ).reshape(-1)
+
+            done += len(batch)
+            if self.metrics is not None:
+                self.metrics.count("tokens", int(lengths[idx].sum()))
+                self.metrics.count("padded_tokens", int(lengths[idx].max()) * len(batch))
+            if self.progress is not None:
+                self.progress("scoring", done, len(pairs))
+        return scores
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
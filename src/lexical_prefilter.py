@@ -0,0 +1,84 @@
+import math
+import re
+
+import numpy as np
+
+# Cheap first-stage retriever (BM25) so the cross-encoder only sees the
+# sentences that have some word overlap with a section's keywords.
+# Built once per syllabus over the sentence list.
+#
+# Words are matched after a crude stem (see stem()), so a section written with
+# other words than its keywords ("office hours" for "contact information") has
+# no overlap at all. Such sentences are not ranked; when fewer than k sentences
+# overlap, the remaining slots go to the first sentences of the document, in
+# order. So with little or no overlap the model still scores k sentences, but a
+# paraphrased section further down can be missed. golden.py's "prefilter" mode
+# and tests/test_lexical_prefilter.py compare the results with prefilter_k=None.
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def stem(token):
+    # very rough stemmer: "exams" -> "exam", "attendance" / "attend" -> "attend",
+    # "disabilities" / "disability" -> "disabi". good enough for matching rubric keywords.
+    if len(token) > 3 and token.endswith("s"):
+        token = token[:-1]
+    return token[:6]
+
+
+def tokenize(text):
+    return [stem(t) for t in TOKEN_RE.findall(text.lower())]
+
+
+class BM25Index:
+    def __init__(self, sentences, k1=1.5, b=0.75):
+        self.size = len(sentences)
+        self.k1 = k1
+        self.b = b
+
+        docs = [tokenize(s) for s in sentences]
+        lengths = np.array([len(d) for d in docs], dtype=np.float64)
+        avg_len = lengths.mean() if self.size else 0.0
+        norm = k1 * (1 - b + b * lengths / avg_len) if avg_len else np.full(self.size, k1)
+
+        # term -> (doc indices, per-doc weight) so a query is just a few numpy adds
+        postings = {}
+        for i, doc in enumerate(docs):
+            counts = {}
+            for term in doc:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((i, tf))
+
+        self.postings = {}
+        for term, hits in postings.items():
+            idx = np.array([i for i, _ in hits])
+            tf = np.array([t for _, t in hits], dtype=np.float64)
+            idf = math.log(1 + (self.size - len(hits) + 0.5) / (len(hits) + 0.5))
+            self.postings[term] = (idx, idf * tf * (k1 + 1) / (tf + norm[idx]))
+
+    def scores(self, query):
+        out = np.zeros(self.size)
+        for term in set(tokenize(query)):
+            hit = self.postings.get(term)
+            if hit is not None:
+                out[hit[0]] += hit[1]
+        return out
+
+    def top_k(self, query, k):
+        # indices of the k best sentences, in document order; ties (including the
+        # sentences with no overlap at all) go to the earlier sentence
+        if k >= self.size:
+            return np.arange(self.size)
+        scores = self.scores(query)
+        top = np.argsort(-scores, kind="stable")[:k]
+        return np.sort(top)
+
+
+def section_candidates(required_sections, sentences, k):
+    # {section: sentence indices} - the top-k sentences for all of the section's keywords together
+    index = BM25Index(sentences)
+    return {
+        section: index.top_k(" ".join(keywords), k)
+        for section, keywords in required_sections.items()
+    }
@@ -0,0 +1,103 @@
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Per-stage timing and counters for one check_syllabus call.
+#
+#   metrics = AnalysisMetrics()
+#   report = check_syllabus(path, metrics=metrics)
+#   metrics.to_dict()   -> {"stages": {"extract": {"wall": .., "cpu": ..}, ...}, "counters": {...}}
+#
+# A callback(stage, wall, cpu) can also be given to hear about stages as they finish.
+#
+# cpu is the CPU time of the thread running the stage, so concurrent analyses
+# (service workers, GUI next to a batch run) do not count each other's work.
+# Work handed to other threads or processes is not in it: torch's intra-op
+# threads, the micro-batcher's scheduler, parallel page extraction.
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+class AnalysisMetrics:
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stages = {}
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            entry = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+            entry["wall"] += wall
+            entry["cpu"] += cpu
+            if self.callback is not None:
+                self.callback(name, wall, cpu)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self):
+        counters = dict(self.counters)
+        counters["peak_rss_mb"] = peak_rss_mb()
+        return {
+            "stages": {k: {"wall": round(v["wall"], 4), "cpu": round(v["cpu"], 4)} for k, v in self.stages.items()},
+            "counters": counters,
+        }
+
+    def summary(self):
+        # one line for a status bar
+        total = sum(v["wall"] for k, v in self.stages.items() if k != "inference")
+        parts = [f"{k} {v['wall']:.1f}s" for k, v in self.stages.items() if v["wall"] >= 0.05]
+        text = f"{total:.1f}s"
+        if parts:
+            text += " (" + ", ".join(parts) + ")"
+        pairs = self.counters.get("model_pairs")
+        if pairs:
+            text += f", {pairs} model pairs"
+        cached = self.counters.get("score_cache_hits")
+        if cached:
+            text += f", {cached} from score cache"
+        return text
+
+
+class CountingModel:
+    # wraps a model so every predict (cross-encoder) or encode (bi-encoder) call
+    # is counted and timed under the "inference" stage
+
+    def __init__(self, model, metrics):
+        self.model = model
+        self.metrics = metrics
+
+    def predict(self, pairs, *args, **kwargs):
+        pairs = list(pairs)
+        self.metrics.count("model_calls")
+        self.metrics.count("model_pairs", len(pairs))
+        with self.metrics.stage("inference"):
+            return self.model.predict(pairs, *args, **kwargs)
+
+    def encode(self, texts, *args, **kwargs):
+        texts = list(texts)
+        self.metrics.count("model_calls")
+        self.metrics.count("encoded_texts", len(texts))
+        with self.metrics.stage("inference"):
+            return self.model.encode(texts, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from length_batching import DEFAULT_MAX_BATCH, DEFAULT_TOKEN_BUDGET, estimate_tokens, length_batches
+from section_scoring import DEFAULT_BATCH_SIZE
+
+# Cross-document micro-batching.
+# When several syllabi are checked at the same time (service threads, a GUI plus
+# a batch run), each check_syllabus call sends its own predict() calls and the
+# last batch of every call is mostly padding. MicroBatcher sits in front of the
+# shared CrossEncoder: callers still call predict(pairs), but their pairs go into
+# one queue and a single scheduler thread feeds the model full batches taken
+# from all waiting documents, then routes each score back to its caller.
+#
+#   batcher = MicroBatcher(get_model(), batch_size=128, max_wait=0.005)
+#   check_syllabus(path, model=batcher)    # from as many threads as you like
+#
+# A round starts as soon as batch_size pairs are waiting, or when the oldest
+# waiting pair has waited max_wait seconds, whichever comes first. The round
+# takes up to max_batch waiting pairs and, like length_batching.BucketedModel,
+# sorts them by length and cuts them into forward passes under token_budget
+# padded tokens, so mixing documents does not bring back short pairs padded to
+# the longest one (token_budget=None: one pass per round, in arrival order).
+
+
+class _Request:
+    __slots__ = ("pairs", "scores", "sent", "remaining", "arrived", "done", "error")
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+        self.scores = np.empty(len(pairs), dtype=np.float32)
+        self.sent = 0            # pairs already handed to the model
+        self.remaining = len(pairs)
+        self.arrived = time.perf_counter()
+        self.done = threading.Event()
+        self.error = None
+
+
+class MicroBatcher:
+    def __init__(self, model, batch_size=DEFAULT_BATCH_SIZE, max_wait=0.005,
+                 token_budget=DEFAULT_TOKEN_BUDGET, max_batch=DEFAULT_MAX_BATCH):
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.token_budget = token_budget
+        self.max_batch = max(max_batch, batch_size)
+
+        self._pending = deque()
+        self._pending_pairs = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {"rounds": 0, "batches": 0, "pairs": 0, "requests": 0, "full_rounds": 0,
+                      "padded_tokens": 0}
+
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def predict(self, pairs, batch_size=None, show_progress_bar=False, **kwargs):
+        # same call shape as CrossEncoder.predict; batch_size is decided by the batcher
+        pairs = list(pairs)
+        if not pairs:
+            return np.empty(0, dtype=np.float32)
+
+        request = _Request(pairs)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed.")
+            self._pending.append(request)
+            self._pending_pairs += len(pairs)
+            self.stats["requests"] += 1
+            self._cond.notify()
+
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.scores
+
+    def _next_batch(self):
+        # waits for enough pairs (or the deadline), then takes up to max_batch of them
+        # returns [(request, start, stop)] or None once closed and drained
+        with self._cond:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+            deadline = self._pending[0].arrived + self.max_wait
+            while self._pending_pairs < self.batch_size and not self._closed:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+
+            pieces = []
+            room = self.max_batch
+            while self._pending and room:
+                request = self._pending[0]
+                take = min(room, len(request.pairs) - request.sent)
+                pieces.append((request, request.sent, request.sent + take))
+                request.sent += take
+                room -= take
+                if request.sent == len(request.pairs):
+                    self._pending.popleft()
+            self._pending_pairs -= self.max_batch - room
+            return pieces
+
+    def _score(self, batch):
+        # scores for one round, in batch order
+        if not self.token_budget:
+            self.stats["batches"] += 1
+            return np.asarray(
+                self.model.predict(batch, batch_size=len(batch), show_progress_bar=False),
+                dtype=np.float32,
+            ).reshape(-1)
+
+        scores = np.empty(len(batch), dtype=np.float32)
+        lengths = estimate_tokens(batch)
+        for idx in length_batches(lengths, self.token_budget, self.max_batch):
+            part = [batch[i] for i in idx]
+            scores[idx] = np.asarray(
+                self.model.predict(part, batch_size=len(part), show_progress_bar=False),
+                dtype=np.float32,
+            ).reshape(-1)
+            self.stats["batches"] += 1
+            self.stats["padded_tokens"] += int(lengths[idx].max()) * len(part)
+        return scores
+
+    def _loop(self):
+        while True:
+            pieces = self._next_batch()
+            if pieces is None:
+                return
+
+            batch = []
+            for request, start, stop in pieces:
+                batch.extend(request.pairs[start:stop])
+
+            try:
+                scores = self._score(batch)
+            except Exception as e:
+                scores = None
+                error = e
+
+            self.stats["rounds"] += 1
+            self.stats["pairs"] += len(batch)
+            if len(batch) >= self.batch_size:
+                self.stats["full_rounds"] += 1
+
+            offset = 0
+            for request, start, stop in pieces:
+                n = stop - start
+                if scores is None:
+                    request.error = error
+                else:
+                    request.scores[start:stop] = scores[offset:offset + n]
+                offset += n
+                request.remaining -= n
+                if request.remaining == 0 or request.error is not None:
+                    # a failed request is answered right away; later pieces of it are still scored and dropped
+                    request.done.set()
+
+    def close(self):
+        # finishes whatever is queued, then stops the scheduler thread
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def __getattr__(self, name):
+        # config, tokenizer etc. come from the wrapped model (model_name() uses them for cache keys)
+        return getattr(self.model, name)
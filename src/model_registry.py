@@ -0,0 +1,94 @@
+import threading
+
+from inference_backends import DEFAULT_BACKEND, check_backend, default_backend, load_cross_encoder
+
+# Shared CrossEncoder models for the whole process.
+# Loading the weights + tokenizer is slow, so every caller (GUI, batch runs)
+# should go through get_model() instead of building a new CrossEncoder.
+# backend picks how the CrossEncoder runs (torch, int8, onnx; see inference_backends.py),
+# None means the SYLLABUS_CHECKER_BACKEND environment variable or torch.
+
+DEFAULT_MODEL_NAME = "cross-encoder/ms-marco-MiniLM-L6-v2"
+DEFAULT_BI_ENCODER_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+_models = {}
+_lock = threading.Lock()
+
+
+def _key(name_or_path, backend):
+    return (name_or_path or DEFAULT_MODEL_NAME, check_backend(backend or default_backend()))
+
+
+def get_model(name_or_path=None, backend=None):
+    # name_or_path can be a huggingface model name or a local folder with the saved model
+    key = _key(name_or_path, backend)
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            # torch / onnxruntime are only imported here, so importing this module stays cheap
+            model = load_cross_encoder(*key)
+            _models[key] = model
+
+    return model
+
+
+def get_bi_encoder(name_or_path=None):
+    # sentence-transformers bi-encoder for engine="bi" (see bi_encoder.py), kept next to the cross-encoders
+    key = ("bi", name_or_path or DEFAULT_BI_ENCODER_NAME)
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(key[1])
+            _models[key] = model
+
+    return model
+
+
+def set_model(model, name_or_path=None, backend=None):
+    # inject an already built model (or a stand-in with a predict() method)
+    key = _key(name_or_path, backend)
+    with _lock:
+        _models[key] = model
+    return model
+
+
+def is_loaded(name_or_path=None, backend=None):
+    key = _key(name_or_path, backend)
+    with _lock:
+        return key in _models
+
+
+def warm_up(name_or_path=None, backend=None):
+    # load the model and run one dummy prediction so the first real
+    # syllabus does not pay for lazy init inside torch / the tokenizer
+    model = get_model(name_or_path, backend)
+    model.predict([("warm up", "warm up the model.")], show_progress_bar=False)
+    return model
+
+
+def clear_models():
+    with _lock:
+        _models.clear()
+
+
+def resolve_model(model=None, backend=None):
+    # check_syllabus accepts a model object, a model name / path, or None (default model)
+    if model is None or isinstance(model, str):
+        return get_model(model, backend)
+    return model
+
+
+def model_name(model=None, backend=None):
+    # a stable name for the model, used in cache keys; non-torch backends score a
+    # little differently, so they get their own name ("...MiniLM-L6-v2@onnx")
+    if model is None or isinstance(model, str):
+        name = model or DEFAULT_MODEL_NAME
+        backend = backend or default_backend()
+    else:
+        config = getattr(model, "config", None)
+        name = getattr(config, "_name_or_path", None) or getattr(model, "name", None) or type(model).__name__
+        backend = getattr(model, "backend", None) or DEFAULT_BACKEND
+    return name if backend == DEFAULT_BACKEND else f"{name}@{backend}"
@@ -0,0 +1,57 @@
+from pdf_extract import page_text
+from section_scoring import DEFAULT_BATCH_SIZE, detect_sections
+from segmenter import Segments, segment, split_sentences
+
+# Page-by-page pipeline: extract -> split into sentences -> score, one page at a time.
+# Sections stop being scored once they pass the threshold, and once every
+# section is resolved the remaining pages are never extracted at all.
+
+
+def iter_page_texts(reader):
+    # generator, so pages after an early exit are never extracted
+    for i, page in enumerate(reader.pages, start=1):
+        yield i, page_text(i, page)[0]
+
+
+def stream_sections(model, required_sections, pages, threshold,
+                    phrase_fast_path=True, batch_size=DEFAULT_BATCH_SIZE, detect=detect_sections,
+                    progress=None):
+    # pages: iterable of (page number, text), e.g. iter_page_texts(reader)
+    # detect: the engine, detect_sections or bi_encoder.bi_detect_sections
+    # progress: optional progress("sections", decided, total) callback, called after each page
+    # returns (results, sentences that were read, number of pages read)
+    results = {sec: {"found": False, "score": 0, "sentence": "", "matched_by": "model"}
+               for sec in required_sections}
+    pending = dict(required_sections)
+    sentences = []
+    segments = Segments()
+    pages_read = 0
+
+    for _, text in pages:
+        pages_read += 1
+        page_sentences = split_sentences(text)
+
+        # only sentences not seen on an earlier page are scored (headers, repeated policy lines)
+        before = len(segments)
+        segment(page_sentences, segments=segments, start=len(sentences))
+        sentences.extend(page_sentences)
+        new_texts = segments.texts[before:]
+        if not new_texts:
+            continue
+
+        page_results = detect(model, pending, new_texts, threshold,
+                              batch_size=batch_size, phrase_fast_path=phrase_fast_path)
+        for section, r in page_results.items():
+            # strictly greater so the earliest sentence wins ties, same as the full pass;
+            # a phrase match has no score but always decides the section
+            if r["matched_by"] == "phrase" or r["score"] > results[section]["score"]:
+                results[section] = r
+            if results[section]["found"]:
+                del pending[section]
+
+        if progress is not None:
+            progress("sections", len(required_sections) - len(pending), len(required_sections))
+        if not pending:
+            break
+
+    return results, sentences, pages_read
@@ -0,0 +1,149 @@
+import atexit
+import multiprocessing
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+
+from pypdf import PdfReader
+
+# Page text extraction, spread over a process pool for long PDFs.
+# pypdf's extract_text is pure Python and takes most of the run on scanned or
+# table-heavy course packs, so long files are cut into page ranges, each range
+# is extracted by a worker process (which opens the PDF itself) and the texts
+# are put back in page order. Short files stay sequential: starting the pool
+# would cost more than it saves.
+#
+# Cancelling (or a failed range) cannot interrupt a worker in the middle of a
+# page, so workers look for a stop file between pages: extract_pages creates
+# it, waits the at most one page each running range needs to notice, and only
+# then returns, so the CPU is free again when it raises.
+#
+# Pages that only hold scanned images (no fonts anywhere) are not run through
+# extract_text at all; they get the same "[No Text Found]" placeholder as
+# pages where extraction came back empty, and their numbers are returned so
+# the report can list them.
+
+PARALLEL_MIN_PAGES = 40     # below this, extraction is always sequential
+RANGES_PER_WORKER = 4       # more, smaller ranges keep the workers evenly busy
+
+_pools = {}   # worker count -> pool; kept apart so a caller never loses a pool it is submitting to
+_pool_lock = threading.Lock()
+
+
+def has_text_layer(page):
+    # False only when the page certainly has no text: no fonts in its resources
+    # and nothing but image XObjects (forms can carry their own fonts)
+    resources = page.get("/Resources")
+    if resources is None:
+        return False
+    resources = resources.get_object()
+    if resources.get("/Font"):
+        return True
+    xobjects = resources.get("/XObject")
+    if not xobjects:
+        return False
+    for ref in xobjects.get_object().values():
+        if ref.get_object().get("/Subtype") != "/Image":
+            return True
+    return False
+
+
+def page_text(i, page):
+    # (text, had text) in the format the rest of the pipeline expects
+    text = page.extract_text() if has_text_layer(page) else ""
+    if text:
+        return text + "\n", True
+    return f"\n--- Page {i} ---\n[No Text Found]\n", False
+
+
+def _extract_range(path, start, stop, stop_file=None):
+    # runs in a worker process; page numbers are 1-based like iter_page_texts.
+    # stops early (returning what it has) once stop_file exists
+    reader = PdfReader(path)
+    out = []
+    for i in range(start, stop):
+        if stop_file is not None and os.path.exists(stop_file):
+            break
+        out.append((i + 1, *page_text(i + 1, reader.pages[i])))
+    return out
+
+
+def _get_pool(workers):
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # spawn, not fork: the GUI and the service call this with threads running
+            pool = _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return pool
+
+
+@atexit.register
+def shutdown_pool():
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def available_cpus():
+    # CPUs this process may run on (containers often allow fewer than os.cpu_count())
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def page_ranges(n_pages, n_ranges):
+    size = max(1, -(-n_pages // n_ranges))
+    return [(start, min(start + size, n_pages)) for start in range(0, n_pages, size)]
+
+
+def extract_pages(path, reader=None, workers=None, min_pages=PARALLEL_MIN_PAGES, progress=None, cancel=None):
+    # returns ([(page number, text)] in page order, [page numbers without text])
+    # workers: processes to use (None = available CPUs, 1 = always sequential)
+    # progress / cancel: as for check_syllabus (see progress.py)
+    reader = reader or PdfReader(path)
+    n_pages = len(reader.pages)
+    workers = workers or available_cpus()
+
+    texts = {}
+    if workers > 1 and n_pages >= min_pages:
+        pool = _get_pool(workers)
+        stop_file = os.path.join(tempfile.gettempdir(), f"syllabus_extract_{os.getpid()}_{uuid.uuid4().hex}.stop")
+        futures = [pool.submit(_extract_range, path, start, stop, stop_file)
+                   for start, stop in page_ranges(n_pages, workers * RANGES_PER_WORKER)]
+        try:
+            for fut in as_completed(futures):
+                if cancel is not None:
+                    cancel.check()
+                for i, text, ok in fut.result():
+                    texts[i] = (text, ok)
+                if progress is not None:
+                    progress("extract", len(texts), n_pages)
+        finally:
+            if len(texts) < n_pages:
+                # cancelled (or failed): drop the queued ranges, stop the running ones at
+                # their next page and wait for that, so nothing keeps the CPU busy
+                for fut in futures:
+                    fut.cancel()
+                try:
+                    open(stop_file, "w").close()
+                    wait(futures)
+                finally:
+                    try:
+                        os.remove(stop_file)
+                    except OSError:
+                        pass
+    else:
+        for i, page in enumerate(reader.pages, start=1):
+            if cancel is not None:
+                cancel.check()
+            texts[i] = page_text(i, page)
+            if progress is not None:
+                progress("extract", i, n_pages)
+
+    pages = [(i, texts[i][0]) for i in range(1, n_pages + 1)]
+    empty = [i for i in range(1, n_pages + 1) if not texts[i][1]]
+    return pages, empty
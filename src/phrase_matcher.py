@@ -0,0 +1,88 @@
+from collections import deque
+from functools import lru_cache
+
+# Aho-Corasick automaton over the rubric keywords.
+# One pass over each sentence finds every keyword that appears verbatim,
+# so sections with an exact phrase hit can skip the cross-encoder entirely.
+
+
+class PhraseMatcher:
+    def __init__(self, phrases):
+        self.phrases = [p.lower() for p in phrases]
+
+        # node 0 is the root; goto[n] maps a character to the next node
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+        for pid, phrase in enumerate(self.phrases):
+            node = 0
+            for ch in phrase:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                node = nxt
+            self.out[node].append(pid)
+
+        # breadth first to fill in failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find(self, text):
+        # yields (start, phrase id) for every match that starts and ends on a word boundary
+        # ("class time" must not match "class timeline", nor "final grade" "final grades")
+        text = text.lower()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for pid in self.out[node]:
+                start = i - len(self.phrases[pid]) + 1
+                end = i + 1
+                if (start == 0 or not text[start - 1].isalnum()) \
+                        and (end == len(text) or not text[end].isalnum()):
+                    yield start, pid
+
+
+@lru_cache(maxsize=8)
+def _compiled(phrases):
+    return PhraseMatcher(phrases)
+
+
+def phrase_hits(required_sections, sentences, min_words=2):
+    # {section: index of the first sentence containing one of its keywords verbatim}
+    # single words like "email" or "exams" are too loose to trust without the model,
+    # so only keywords with at least min_words words are used
+    owners = []
+    phrases = []
+    for section, keywords in required_sections.items():
+        for kw in keywords:
+            if len(kw.split()) >= min_words:
+                owners.append(section)
+                phrases.append(kw)
+
+    hits = {}
+    if not phrases:
+        return hits
+
+    matcher = _compiled(tuple(phrases))
+    for idx, sentence in enumerate(sentences):
+        for _, pid in matcher.find(sentence):
+            hits.setdefault(owners[pid], idx)
+        if len(hits) == len(required_sections):
+            break
+
+    return hits
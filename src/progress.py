@@ -0,0 +1,109 @@
+import threading
+
+# Progress reporting and cancellation for check_syllabus.
+#
+#   token = CancelToken()
+#   check_syllabus(path, progress=on_progress, cancel=token)   # on a worker thread
+#   token.cancel()                                              # from anywhere else
+#
+# on_progress(stage, done, total) is called with
+#   "extract"   pages extracted so far / pages in the PDF
+#   "scoring"   (keyword, sentence) pairs scored so far / pairs in this scoring pass
+#               (bi-encoder: texts encoded so far / texts in this encode call)
+#   "sections"  sections decided so far / sections in the rubric
+# The token is checked between pages and between model batches, and
+# check_syllabus raises AnalysisCancelled as soon as it sees it.
+# Cheap to import (the GUI does so at startup).
+
+
+class AnalysisCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise AnalysisCancelled("Analysis cancelled.")
+
+
+def watch_pages(pages, total, progress=None, cancel=None):
+    # wraps iter_page_texts: cancel check before each page, progress after it
+    for n, (i, text) in enumerate(pages, start=1):
+        if cancel is not None:
+            cancel.check()
+        yield i, text
+        if progress is not None:
+            progress("extract", n, total)
+
+
+class ProgressModel:
+    # model wrapper that sends predict() / encode() to the model one batch at a
+    # time so progress can be reported (and cancellation noticed) between batches
+
+    def __init__(self, model, progress=None, cancel=None):
+        self.model = model
+        self.progress = progress
+        self.cancel = cancel
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False, **kwargs):
+        pairs = list(pairs)
+        if self.cancel is not None:
+            self.cancel.check()
+        if len(pairs) <= batch_size:
+            scores = self.model.predict(pairs, batch_size=batch_size, show_progress_bar=False, **kwargs)
+            if self.progress is not None:
+                self.progress("scoring", len(pairs), len(pairs))
+            return scores
+
+        # imported here so the GUI can import this module before numpy is loaded
+        import numpy as np
+
+        out = []
+        for start in range(0, len(pairs), batch_size):
+            if self.cancel is not None:
+                self.cancel.check()
+            chunk = pairs[start:start + batch_size]
+            out.append(np.asarray(
+                self.model.predict(chunk, batch_size=batch_size, show_progress_bar=False, **kwargs)
+            ).reshape(-1))
+            if self.progress is not None:
+                self.progress("scoring", start + len(chunk), len(pairs))
+        return np.concatenate(out)
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        # bi-encoder, same idea as predict
+        texts = list(texts)
+        if self.cancel is not None:
+            self.cancel.check()
+        if len(texts) <= batch_size:
+            vectors = self.model.encode(texts, batch_size=batch_size, show_progress_bar=False, **kwargs)
+            if self.progress is not None:
+                self.progress("scoring", len(texts), len(texts))
+            return vectors
+
+        import numpy as np
+
+        out = []
+        for start in range(0, len(texts), batch_size):
+            if self.cancel is not None:
+                self.cancel.check()
+            chunk = texts[start:start + batch_size]
+            out.append(np.asarray(
+                self.model.encode(chunk, batch_size=batch_size, show_progress_bar=False, **kwargs)
+            ))
+            if self.progress is not None:
+                self.progress("scoring", start + len(chunk), len(texts))
+        return np.concatenate(out)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
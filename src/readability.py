@@ -0,0 +1,135 @@
+import math
+import re
+import sys
+from functools import lru_cache
+from importlib import resources
+
+from pyphen import Pyphen
+
+# Flesch Reading Ease, Flesch-Kincaid Grade, Gunning Fog and SMOG from one set of counts.
+# Follows textstat 0.7.3 (English) exactly, but the text is only tokenized once
+# and syllable counts are memoized per word for the whole process, so the same
+# words across many syllabi are only hyphenated once.
+#
+#   python readability.py some_text.txt ...   -> compares against textstat
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+SENTENCE = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+FOG_WORD = re.compile(r"[\w\='‘’]+")
+
+_pyphen = Pyphen(lang="en_US")
+
+
+@lru_cache(maxsize=None)
+def _easy_words():
+    # Dale-Chall easy word list shipped with textstat
+    data = resources.files("textstat").joinpath("resources/en/easy_words.txt").read_bytes()
+    return frozenset(line.strip() for line in data.decode("utf-8").splitlines())
+
+
+@lru_cache(maxsize=200_000)
+def word_syllables(word):
+    # word is lowercase with punctuation already removed
+    return len(_pyphen.positions(word)) + 1
+
+
+def _legacy_round(number, points):
+    # textstat's rounding (half away from zero)
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+
+def text_counts(text):
+    # one tokenization of the text -> every count the formulas need
+    stripped = PUNCTUATION.sub("", text)
+    words = stripped.lower().split()
+
+    sentences = SENTENCE.findall(text)
+    # textstat ignores "sentences" of two words or less (headings, list items, ...)
+    short = sum(1 for s in sentences if len(PUNCTUATION.sub("", s).split()) <= 2)
+
+    # SMOG counts every whitespace-separated token of 3+ syllables, repeats included
+    # (hyphenated words and contractions are one word there)
+    smog_polysyllables = 0
+    for token in text.lower().split():
+        if sum(word_syllables(w) for w in PUNCTUATION.sub("", token).split()) >= 3:
+            smog_polysyllables += 1
+
+    easy = _easy_words()
+    polysyllables = 0
+    for token in set(FOG_WORD.findall(text.lower())):
+        if token in easy:
+            continue
+        parts = PUNCTUATION.sub("", token).split()
+        if sum(word_syllables(w) for w in parts) >= 3:
+            polysyllables += 1
+
+    return {
+        "words": len(words),
+        "sentences": max(1, len(sentences) - short),
+        "syllables": sum(word_syllables(w) for w in words),
+        "polysyllables": polysyllables,
+        "smog_polysyllables": smog_polysyllables,
+    }
+
+
+def scores_from_counts(counts):
+    words = counts["words"]
+    if not words:
+        return {"flesch_reading_ease": _legacy_round(206.835, 2),
+                "flesch_kincaid_grade": _legacy_round(-15.59, 1),
+                "gunning_fog": 0.0,
+                "smog_index": 0.0}
+
+    sentence_length = _legacy_round(words / counts["sentences"], 1)
+    syllables_per_word = _legacy_round(counts["syllables"] / words, 1)
+    difficult_percent = counts["polysyllables"] / words * 100
+
+    # textstat only scores SMOG from 3 sentences up (the formula is meant for 30)
+    smog = 0.0
+    if counts["sentences"] >= 3:
+        smog = _legacy_round(1.043 * (30 * counts["smog_polysyllables"] / counts["sentences"]) ** .5 + 3.1291, 1)
+
+    return {
+        "flesch_reading_ease": _legacy_round(206.835 - 1.015 * sentence_length - 84.6 * syllables_per_word, 2),
+        "flesch_kincaid_grade": _legacy_round(0.39 * sentence_length + 11.8 * syllables_per_word - 15.59, 1),
+        "gunning_fog": _legacy_round(0.4 * (sentence_length + difficult_percent), 2),
+        "smog_index": smog,
+    }
+
+
+def readability_scores(text):
+    return scores_from_counts(text_counts(text))
+
+
+def parity_mismatches(texts):
+    # [(index, metric, ours, textstat)] for every score that differs from textstat
+    import textstat
+
+    reference = {
+        "flesch_reading_ease": textstat.flesch_reading_ease,
+        "flesch_kincaid_grade": textstat.flesch_kincaid_grade,
+        "gunning_fog": textstat.gunning_fog,
+        "smog_index": textstat.smog_index,
+    }
+    mismatches = []
+    for i, text in enumerate(texts):
+        ours = readability_scores(text)
+        for metric, fn in reference.items():
+            expected = fn(text)
+            if ours[metric] != expected:
+                mismatches.append((i, metric, ours[metric], expected))
+    return mismatches
+
+
+if __name__ == "__main__":
+    texts = []
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read())
+
+    bad = parity_mismatches(texts)
+    for i, metric, ours, expected in bad:
+        print(f"{sys.argv[1 + i]}: {metric} = {ours}, textstat = {expected}")
+    print(f"{len(texts)} text(s) checked, {len(bad)} mismatch(es)")
+    sys.exit(1 if bad else 0)
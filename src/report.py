@@ -0,0 +1,73 @@
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+# Structured result of one syllabus check.
+# check_syllabus returns a SyllabusReport; turning it into text, Tk widgets,
+# a PDF or JSON is done by the renderers in report_render.py.
+
+
+@dataclass(slots=True)
+class SectionResult:
+    name: str
+    found: bool
+    score: Optional[float]   # best model score; None when a verbatim phrase decided it
+    sentence: str
+    matched_by: str = "model"   # "phrase" (phrase_fast_path) or "model"
+
+
+@dataclass(slots=True)
+class ReadabilityResult:
+    flesch_reading_ease: float
+    flesch_kincaid_grade: float
+    gunning_fog: float
+    # where each score landed for this course level (the report text is picked from these)
+    clarity: str       # "easy", "ideal", "dense" or "hard"
+    level: str         # "low", "ok" or "high"
+    complexity: str    # "low", "ok" or "high"
+    passes: int        # how many of the three checks are in the ideal range (0-3)
+
+
+@dataclass(slots=True)
+class SyllabusReport:
+    file_name: str = ""
+    course: str = "Unknown"
+    instructor: str = "Unknown"
+    semester: str = "Unknown"
+    course_level: Optional[int] = None
+    sections: List[SectionResult] = field(default_factory=list)
+    readability: Optional[ReadabilityResult] = None
+    score: int = 0
+    grade: str = ""
+    pages_read: int = 0
+    pages_total: int = 0
+    boilerplate_removed: int = 0   # repeated header / footer lines dropped before analysis
+    empty_pages: List[int] = field(default_factory=list)   # pages with no extractable text (scans)
+    rubric: str = ""               # name, version and hash of the rubric used (rubric.Rubric.label)
+    rubric_path: str = ""          # its file, so the report is rendered with the same messages
+    warnings: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def found(self):
+        return [s.name for s in self.sections if s.found]
+
+    @property
+    def missing(self):
+        return [s.name for s in self.sections if not s.found]
+
+    def section(self, name):
+        for s in self.sections:
+            if s.name == name:
+                return s
+        raise KeyError(name)
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["sections"] = [SectionResult(**s) for s in data.get("sections", [])]
+        if data.get("readability") is not None:
+            data["readability"] = ReadabilityResult(**data["readability"])
+        return cls(**data)
@@ -0,0 +1,342 @@
+import json
+from functools import lru_cache
+
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from rubric import load_rubric
+
+# Renderers over a report.SyllabusReport: plain text, Tk Text widget, PDF and JSON.
+# They all share report_lines(), which lays the report out as lines of
+# (text, color) spans; color is None for normal text. The recommendation and
+# kudos messages come from the rubric the report was checked against
+# (report.rubric_path), unless a rubric is passed in.
+
+GREEN = "#00FF00"
+YELLOW = "#FFFF00"
+RED = "#FF0000"
+
+GRADE_COLORS = {"INCOMPLETE": RED}
+
+OVERALL_READABILITY = {
+    3: ("GREAT! Your syllabus is clear and easy to understand.", GREEN),
+    2: ("GOOD, BUT COULD USE SOME IMPROVEMENT.", YELLOW),
+}
+OVERALL_READABILITY_LOW = ("NEEDS IMPROVEMENT. Some parts may be difficult for students to understand.", RED)
+
+# clarity and flow will represent flesch reading ease
+CLARITY_TEXT = {
+    # Very easy – clear, but might be a bit simple for higher-level courses
+    "easy": [
+        "  ✓ What you did well:",
+        "    - Sentences are short, clear, and easy to follow.",
+        "    - Students can quickly understand what you mean.",
+        "  Suggestions:",
+        "    - If this is a higher-level course, consider adding a bit more detail or discipline-specific phrasing while keeping sentences clear.",
+    ],
+    # Ideal zone → only kudos, no suggestions
+    "ideal": [
+        "  ✓ What you did well:",
+        "    - The syllabus flows smoothly for college readers.",
+        "    - Information is clear without feeling oversimplified or overly dense.",
+        "  Keep doing what you are doing with sentence length and flow.",
+    ],
+    # Slightly challenging, but not terrible
+    "dense": [
+        "  ✓ What you did well:",
+        "    - You provide detailed information that reflects the rigor of the course.",
+        "  Suggestions:",
+        "    - Shorten or split up longer sentences so each one focuses on a single idea.",
+        "    - Remove extra filler words or repeated phrases to make the text feel lighter.",
+    ],
+    # quite hard
+    "hard": [
+        "  ✓ What you did well:",
+        "    - The syllabus appears thorough and covers important information.",
+        "  Suggestions:",
+        "    - Break up large blocks of text with headings or bullet points.",
+        "    - Use shorter, more direct sentences for key expectations.",
+        "    - Put the most important point at the beginning of the sentence whenever possible.",
+    ],
+}
+
+# is it appropriate for course level? --> going to represent flesch kincaid grade
+LEVEL_TEXT = {
+    # Ideal FK range → only kudos
+    "ok": [
+        "  ✓ What you did well:",
+        "    - The reading level fits what we expect for this course level.",
+        "    - The tone feels professional while still being accessible to students.",
+        "  Keep this balance of academic language and clarity.",
+    ],
+    # Too simple for the level
+    "low": [
+        "  ✓ What you did well:",
+        "    - The syllabus is very accessible and friendly to read.",
+        "  Suggestions:",
+        "    - Add a bit more academic or discipline-specific language where it helps clarify expectations.",
+        "    - Provide slightly more detail in key sections, such as major assignments or grading criteria.",
+    ],
+    # too advanced
+    "high": [
+        "  ✓ What you did well:",
+        "    - The writing reflects a serious, academic tone appropriate for higher education.",
+        "  Suggestions:",
+        "    - Simplify longer or highly formal sentences, especially in policy-heavy areas.",
+        "    - Make instructions and deadlines as direct and straightforward as possible.",
+        "    - Briefly define specialized terms when they first appear.",
+    ],
+}
+
+# word choice and complexity will represent gunning fog index
+COMPLEXITY_TEXT = {
+    # Very simple wording
+    "low": [
+        "  ✓ What you did well:",
+        "    - Vocabulary is straightforward and easy to understand.",
+        "    - Students can quickly grasp what you are saying without getting stuck on the wording.",
+        "  Suggestions:",
+        "    - For upper-level or writing-intensive courses, consider adding key discipline-specific terms where appropriate.",
+        "    - Make sure important concepts are described with enough precision, even while staying clear.",
+    ],
+    # Ideal zone → only kudos
+    "ok": [
+        "  ✓ What you did well:",
+        "    - Word choice feels balanced: not too simple, but not overly dense.",
+        "    - Complex ideas are explained in a way that students can process without feeling overwhelmed.",
+        "  Keep this mix of everyday language and necessary academic terms.",
+    ],
+    # too dense
+    "high": [
+        "  ✓ What you did well:",
+        "    - The syllabus shows strong command of the subject and covers a lot of information.",
+        "  Suggestions:",
+        "    - Replace very long or technical words with simpler alternatives when possible.",
+        "    - Shorten dense sections and avoid packing too many ideas into a single sentence.",
+        "    - Use bullet points or numbered lists for complex rules or multi-step processes.",
+    ],
+}
+
+
+def _readability_lines(r):
+    lines = []
+
+    overall, color = OVERALL_READABILITY.get(r.passes, OVERALL_READABILITY_LOW)
+    lines.append([("\n\nREADABILITY REPORT", None)])
+    lines.append([("OVERALL RESULT: ", None), (overall, color)])
+
+    lines.append([("\nClarity and Flow:", None)])
+    lines.append([("  → Think of this as how smoothly the syllabus reads on a first pass.", None)])
+    lines.extend([(t, None)] for t in CLARITY_TEXT[r.clarity])
+
+    lines.append([("\nAppropriate for Course Level:", None)])
+    lines.append([("  → Think of this as whether the reading feels like it matches a course at this level.", None)])
+    lines.extend([(t, None)] for t in LEVEL_TEXT[r.level])
+
+    lines.append([("\nWord Choice and Complexity:", None)])
+    lines.append([("  → Think of this as how heavy the wording feels, based on sentence length and bigger words.", None)])
+    lines.extend([(t, None)] for t in COMPLEXITY_TEXT[r.complexity])
+
+    # if at most 1 test passes, then we add more overall suggestions for user.
+    if r.passes <= 1:
+        lines.append([("\nOverall Suggestions:", None)])
+        lines.append([("  • Use bullet points for key policies, deadlines, and grading details.", None)])
+        lines.append([("  • Add clear section headers so students can quickly find what they need.", None)])
+        lines.append([("  • Keep the most important rules short, direct, and easy to scan.", None)])
+
+    return lines
+
+
+def report_lines(report, rubric=None):
+    # the report laid out line by line; each line is a list of (text, color) spans
+    if report.error:
+        return [[(report.error, None)]]
+    rubric = rubric or load_rubric(report.rubric_path or None)
+
+    lines = [[(w, None)] for w in report.warnings]
+    add = lines.append
+
+    add([(f"COURSE: {report.course}, INSTRUCTOR: {report.instructor}, SEMESTER: {report.semester}", None)])
+
+    # 1. CONTENT ANALYSIS (FIRST BLOCK)
+    add([("\n\nCONTENT ANALYSIS REPORT", None)])
+    if report.pages_read < report.pages_total:
+        add([(f"(All sections found by page {report.pages_read} of {report.pages_total}; "
+                "remaining pages were skipped.)", None)])
+    if report.empty_pages:
+        add([(f"(No text found on page(s) {', '.join(map(str, report.empty_pages))}; "
+              "scanned pages are not analyzed.)", None)])
+    if report.boilerplate_removed:
+        add([(f"(Ignored {report.boilerplate_removed} repeated header/footer lines.)", None)])
+    for s in report.sections:
+        status = "✓ Found" if s.found else "✗ Not Found"
+        add([(f"{s.name:<35} {status:<12}", None)])
+
+    missing = report.missing
+    found_ok = report.found
+
+    # 3. FINAL SUMMARY (SECOND BLOCK)
+    add([("\n\nFINAL SUMMARY", None)])
+    add([("GRADE: ", None), (report.grade, GRADE_COLORS.get(report.grade, GREEN))])
+    add([("", None)])
+
+    if missing:
+        add([("\nSections Not Found:", None)])
+        for sec in missing:
+            add([(f"  ✗ {sec}", None)])
+        add([("\nSections Found:", None)])
+        for sec in found_ok:
+            add([(f"  ✓ {sec}", None)])
+
+    # 4. RECOMMENDATIONS (THIRD BLOCK)
+    if missing:
+        add([("\n\nRECOMMENDATIONS FOR SECTIONS NOT FOUND", None)])
+        for sec in missing:
+            add([(f"\n• {sec}:", None)])
+            add([(f"  → {rubric.recommendations[sec]}", None)])
+
+    # 2. READABILITY REPORT (FOURTH BLOCK — PRINTED HERE)
+    if report.readability is not None:
+        lines.extend(_readability_lines(report.readability))
+
+    # 5. KUDOS (LAST BLOCK)
+    if found_ok:
+        add([("\n\nKUDOS FOR SECTIONS FOUND", None)])
+        for sec in found_ok:
+            add([(f"\n• {sec}:", None)])
+            add([(f"  ✓ {rubric.kudos[sec]}", None)])
+
+    return lines
+
+
+def render_text(report, markup=False, rubric=None):
+    # markup=True keeps the old <color=#RRGGBB>...</color> tags around colored spans
+    out = []
+    for line in report_lines(report, rubric):
+        parts = []
+        for text, color in line:
+            if color and markup:
+                parts.append(f"<color={color}>{text}</color>")
+            else:
+                parts.append(text)
+        out.append("".join(parts))
+    return "\n".join(out)
+
+
+def render_json(report, **kwargs):
+    return json.dumps(report.to_dict(), **kwargs)
+
+
+def render_tk(report, text_widget, font=("Segoe UI", 15, "bold"), rubric=None):
+    # inserts the report into a Tk Text widget, colored spans get a bold colored tag
+    for line in report_lines(report, rubric):
+        for text, color in line:
+            if color:
+                tag_name = f"color_{color}"
+                if tag_name not in text_widget.tag_names():
+                    text_widget.tag_config(tag_name, foreground=color, font=font)
+                text_widget.insert("end", text, tag_name)
+            else:
+                text_widget.insert("end", text)
+        text_widget.insert("end", "\n")
+
+
+PDF_FONT = "Helvetica"
+PDF_FONT_SIZE = 15
+PDF_LINE_HEIGHT = 19
+PDF_MARGIN = 50
+PDF_TOP = 60
+PDF_BOTTOM = 60
+
+
+@lru_cache(maxsize=8192)
+def word_width(word, font=PDF_FONT, size=PDF_FONT_SIZE):
+    # report text repeats the same words a lot, so each width is measured once
+    return stringWidth(word, font, size)
+
+
+def wrap_line(line, max_width, font=PDF_FONT, size=PDF_FONT_SIZE):
+    # greedy word wrap, adding up word widths instead of re-measuring the whole line
+    # (Helvetica has no kerning, so the widths simply add up)
+    space = word_width(" ", font, size)
+    wrapped = []
+    current = []
+    current_width = 0.0
+
+    for word in line.split():
+        w = word_width(word, font, size)
+        if current and current_width + space + w <= max_width:
+            current.append(word)
+            current_width += space + w
+        else:
+            # a word wider than the page still gets its own line
+            if current:
+                wrapped.append(" ".join(current))
+            current = [word]
+            current_width = w
+
+    if current:
+        wrapped.append(" ".join(current))
+    return wrapped
+
+
+class PdfReportWriter:
+    # one canvas that any number of reports can be written into
+
+    def __init__(self, filepath):
+        self.canvas = canvas.Canvas(filepath, pagesize=letter)
+        self.width, self.height = letter
+        self.usable_width = self.width - 2 * PDF_MARGIN
+        self.canvas.setFont(PDF_FONT, PDF_FONT_SIZE)
+        self.y = self.height - PDF_TOP
+        self.page_used = False
+
+    def _next_line(self):
+        self.y -= PDF_LINE_HEIGHT
+        if self.y < PDF_BOTTOM:
+            self.new_page()
+
+    def new_page(self):
+        self.canvas.showPage()
+        self.canvas.setFont(PDF_FONT, PDF_FONT_SIZE)
+        self.y = self.height - PDF_TOP
+        self.page_used = False
+
+    def write_text(self, text):
+        for line in text.split("\n"):
+            wrapped = wrap_line(line, self.usable_width)
+            if not wrapped:
+                # blank line
+                self.page_used = True
+                self._next_line()
+                continue
+
+            for wline in wrapped:
+                self.canvas.drawString(PDF_MARGIN, self.y, wline)
+                self.page_used = True
+                self._next_line()
+
+    def save(self):
+        self.canvas.save()
+
+
+def save_report_as_pdf(text, filepath):
+    writer = PdfReportWriter(filepath)
+    writer.write_text(text)
+    writer.save()
+
+
+def render_pdf(report, filepath, rubric=None):
+    save_report_as_pdf(render_text(report, rubric=rubric), filepath)
+
+
+def save_reports_as_pdf(reports, filepath):
+    # bulk export: many reports (SyllabusReport or already rendered text) in one PDF,
+    # each starting on a fresh page, sharing one canvas and font setup
+    writer = PdfReportWriter(filepath)
+    for report in reports:
+        if writer.page_used:
+            writer.new_page()
+        writer.write_text(report if isinstance(report, str) else render_text(report))
+    writer.save()
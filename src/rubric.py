@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from phrase_matcher import _compiled
+
+# The rubric (required sections, their keywords, thresholds and messages, and the
+# readability bands per course level) lives in a versioned JSON file. It is
+# loaded and compiled once per process and shared by every analysis; the
+# content hash goes into the cache keys, so editing the file never serves stale
+# reports. A campus can use its own rubric without code changes:
+#
+#   SYLLABUS_CHECKER_RUBRIC=/path/to/our_rubric.json python SyllabusChecker.py
+#   python batch_check.py syllabi/ --rubric our_rubric.json
+#
+# File format (see rubric.json):
+#   {"name": ..., "version": 1, "threshold": 0.4,
+#    "sections": [{"name": ..., "keywords": [...], "threshold": 0.5 (optional),
+#                  "recommendation": ..., "kudos": ...}, ...],
+#    "readability_levels": {"0": {"FRE": [easy, ideal_min, warn_min], "FK": [min, max], "FOG": [min, max]}, ...}}
+
+RUBRIC_ENV = "SYLLABUS_CHECKER_RUBRIC"
+DEFAULT_RUBRIC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rubric.json")
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class Rubric:
+    name: str
+    version: int
+    threshold: float                                  # default cut-off for the cross-encoder
+    sections: Dict[str, List[str]]                    # section -> lowercased keywords, in rubric order
+    thresholds: Dict[str, float]                      # section -> cut-off (threshold unless overridden)
+    recommendations: Dict[str, str]
+    kudos: Dict[str, str]
+    readability_levels: Dict[int, Dict[str, Tuple]]
+    digest: str = ""                                  # sha256 of the file contents
+    path: str = ""
+
+    @property
+    def label(self):
+        return f"{self.name} v{self.version} ({self.digest[:8]})"
+
+
+def rubric_path(path=None):
+    return os.path.abspath(path or os.environ.get(RUBRIC_ENV) or DEFAULT_RUBRIC_PATH)
+
+
+def parse_rubric(data, digest="", path=""):
+    # dict (from the JSON file) -> compiled Rubric; raises ValueError with what is wrong
+    where = f" {path}" if path else ""
+    try:
+        threshold = float(data["threshold"])
+        sections, thresholds, recommendations, kudos = {}, {}, {}, {}
+        for entry in data["sections"]:
+            name = entry["name"]
+            if name in sections:
+                raise ValueError(f"section '{name}' is listed twice")
+            keywords = [kw.strip().lower() for kw in entry["keywords"] if kw.strip()]
+            if not keywords:
+                raise ValueError(f"section '{name}' has no keywords")
+            sections[name] = keywords
+            thresholds[name] = float(entry.get("threshold", threshold))
+            recommendations[name] = entry["recommendation"]
+            kudos[name] = entry["kudos"]
+
+        levels = {}
+        for level, bands in data["readability_levels"].items():
+            levels[int(level)] = {
+                "FRE": tuple(bands["FRE"]),
+                "FK": tuple(bands["FK"]),
+                "FOG": tuple(bands["FOG"]),
+            }
+            if len(levels[int(level)]["FRE"]) != 3 or len(levels[int(level)]["FK"]) != 2 \
+                    or len(levels[int(level)]["FOG"]) != 2:
+                raise ValueError(f"readability level {level} needs FRE [3 numbers], FK and FOG [2 numbers]")
+
+        rubric = Rubric(
+            name=data.get("name", "Unnamed rubric"),
+            version=int(data.get("version", 1)),
+            threshold=threshold,
+            sections=sections,
+            thresholds=thresholds,
+            recommendations=recommendations,
+            kudos=kudos,
+            readability_levels=levels,
+            digest=digest,
+            path=path,
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid rubric{where}: missing or malformed {e}") from None
+    except ValueError as e:
+        raise ValueError(f"Invalid rubric{where}: {e}") from None
+
+    # build the verbatim phrase matcher for the full rubric now instead of on the first syllabus
+    phrases = tuple(kw for kws in sections.values() for kw in kws if len(kw.split()) >= 2)
+    if phrases:
+        _compiled(phrases)
+    return rubric
+
+
+def load_rubric(path=None):
+    # the compiled rubric for path (default: $SYLLABUS_CHECKER_RUBRIC or rubric.json next to
+    # this file); loaded once and reloaded only when the file changes
+    path = rubric_path(path)
+    stamp = os.stat(path).st_mtime_ns
+
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except ValueError as e:
+        raise ValueError(f"Invalid rubric {path}: {e}") from None
+    rubric = parse_rubric(data, hashlib.sha256(raw).hexdigest(), path)
+
+    with _lock:
+        _loaded[path] = (stamp, rubric)
+    return rubric
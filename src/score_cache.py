@@ -0,0 +1,174 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from segmenter import normalize
+
+# Persistent (model, keyword, sentence) -> score store.
+# Policy paragraphs (academic integrity, CAPS, disability resources, report bias)
+# are copied word for word into almost every syllabus, so their pairs are scored
+# by the model once and read back from SQLite afterwards.
+#
+#   scores = ScoreCache()
+#   check_syllabus(path, score_cache=scores)
+#   scores.hit_rate()
+#
+# The stored value is the model's raw output, so it does not depend on the
+# threshold. The result cache (result_cache.py) is separate: it only helps
+# when the exact same PDF comes back. Both are trimmed least-recently-used
+# first, so the copied policy pairs stay while one-off sentences go.
+
+DEFAULT_MAX_ROWS = 2_000_000
+LOOKUP_CHUNK = 500   # stay well under SQLite's bound parameter limit
+
+
+def default_score_cache_path():
+    return os.path.join(os.path.expanduser("~"), ".syllabus_checker", "scores.sqlite")
+
+
+def sentence_hash(sentence):
+    # sentences that only differ in case / spacing share one entry
+    return hashlib.sha1(normalize(sentence).encode("utf-8")).digest()
+
+
+class ScoreCache:
+    def __init__(self, path=None, max_rows=DEFAULT_MAX_ROWS):
+        self.path = path or default_score_cache_path()
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " model TEXT NOT NULL,"
+            " keyword TEXT NOT NULL,"
+            " sentence BLOB NOT NULL,"
+            " score REAL NOT NULL,"
+            " last_used REAL NOT NULL DEFAULT 0,"
+            " UNIQUE (model, keyword, sentence))"
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(scores)")]
+        if "last_used" not in columns:
+            # file from before LRU eviction: its rows count as least recently used
+            self._db.execute("ALTER TABLE scores ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores(last_used)")
+        self._db.commit()
+
+    def lookup(self, model, pairs):
+        # returns a list with the stored score or None for every (keyword, sentence) pair
+        by_keyword = {}
+        for i, (keyword, sentence) in enumerate(pairs):
+            by_keyword.setdefault(keyword, []).append((i, sentence_hash(sentence)))
+
+        out = [None] * len(pairs)
+        now = time.time()
+        with self._lock:
+            for keyword, items in by_keyword.items():
+                for start in range(0, len(items), LOOKUP_CHUNK):
+                    chunk = items[start:start + LOOKUP_CHUNK]
+                    hashes = list({h for _, h in chunk})
+                    rows = self._db.execute(
+                        "SELECT sentence, score FROM scores WHERE model = ? AND keyword = ?"
+                        f" AND sentence IN ({','.join('?' * len(hashes))})",
+                        [model, keyword, *hashes],
+                    ).fetchall()
+                    found = dict(rows)
+                    for i, h in chunk:
+                        out[i] = found.get(h)
+                    if found:
+                        self._db.execute(
+                            "UPDATE scores SET last_used = ? WHERE model = ? AND keyword = ?"
+                            f" AND sentence IN ({','.join('?' * len(found))})",
+                            [now, model, keyword, *found],
+                        )
+            self._db.commit()
+
+            n_hits = sum(s is not None for s in out)
+            self.hits += n_hits
+            self.misses += len(out) - n_hits
+        return out
+
+    def store(self, model, pairs, scores):
+        now = time.time()
+        rows = [(model, kw, sentence_hash(s), float(score), now) for (kw, s), score in zip(pairs, scores)]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scores (model, keyword, sentence, score, last_used)"
+                " VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        # least recently used rows go first once the table is over max_rows
+        count = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        if count > self.max_rows:
+            self._db.execute(
+                "DELETE FROM scores WHERE rowid IN"
+                " (SELECT rowid FROM scores ORDER BY last_used, rowid LIMIT ?)",
+                (count - self.max_rows,),
+            )
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate(), 4)}
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM scores")
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class CachedScorer:
+    # model wrapper: predict() answers known pairs from the ScoreCache and only
+    # sends the rest to the model, then records their scores
+    # (metrics, when given, gets score_cache_hits / score_cache_misses counters)
+
+    def __init__(self, model, cache, name, metrics=None):
+        self.model = model
+        self.cache = cache
+        self.name = name
+        self.metrics = metrics
+
+    def predict(self, pairs, *args, **kwargs):
+        pairs = list(pairs)
+        known = self.cache.lookup(self.name, pairs)
+        todo = [i for i, s in enumerate(known) if s is None]
+        if self.metrics is not None:
+            self.metrics.count("score_cache_hits", len(pairs) - len(todo))
+            self.metrics.count("score_cache_misses", len(todo))
+
+        scores = np.array([0.0 if s is None else s for s in known], dtype=np.float32)
+        if todo:
+            new_pairs = [pairs[i] for i in todo]
+            new_scores = np.asarray(self.model.predict(new_pairs, *args, **kwargs), dtype=np.float32).reshape(-1)
+            scores[todo] = new_scores
+            self.cache.store(self.name, new_pairs, new_scores)
+        return scores
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
@@ -0,0 +1,129 @@
+import numpy as np
+
+from lexical_prefilter import section_candidates
+from phrase_matcher import phrase_hits
+
+# Batched section detection.
+# Instead of one model.predict per keyword, we build every (keyword, sentence)
+# pair once, score them all in one predict call (the model batches internally),
+# and then reduce the keyword x sentence matrix with numpy.
+
+DEFAULT_BATCH_SIZE = 128
+
+
+def keyword_rows(required_sections):
+    # flatten {section: [keywords]} into one row per keyword, in rubric order
+    rows = []
+    for section, keywords in required_sections.items():
+        for kw in keywords:
+            rows.append((section, kw))
+    return rows
+
+
+def sigmoid(scores):
+    return 1 / (1 + np.exp(-np.asarray(scores, dtype=np.float64)))
+
+
+def score_matrix(model, keywords, sentences, batch_size=DEFAULT_BATCH_SIZE, candidates=None):
+    # returns an array of shape (len(keywords), len(sentences)) with probabilities.
+    # candidates (optional) gives, per keyword, the sentence indices worth scoring;
+    # everything else stays at 0 and never reaches the model.
+    matrix = np.zeros((len(keywords), len(sentences)))
+    if not keywords or not sentences:
+        return matrix
+
+    lowered = [s.lower() for s in sentences]
+
+    if candidates is None:
+        pairs = [(kw.lower(), s) for kw in keywords for s in lowered]
+        scores = model.predict(pairs, batch_size=batch_size, show_progress_bar=False)
+        return sigmoid(scores).reshape(len(keywords), len(sentences))
+
+    row_idx = np.concatenate([np.full(len(c), i) for i, c in enumerate(candidates)]).astype(int)
+    col_idx = np.concatenate([np.asarray(c) for c in candidates]).astype(int)
+    if len(col_idx) == 0:
+        return matrix
+
+    pairs = [(keywords[i].lower(), lowered[j]) for i, j in zip(row_idx, col_idx)]
+    scores = model.predict(pairs, batch_size=batch_size, show_progress_bar=False)
+    matrix[row_idx, col_idx] = sigmoid(scores)
+    return matrix
+
+
+def section_score_matrix(model, required_sections, sentences, batch_size=DEFAULT_BATCH_SIZE, prefilter_k=None):
+    # public helper so callers can inspect the raw scores:
+    # matrix[i, j] is the probability that sentence j matches rows[i] = (section, keyword)
+    rows = keyword_rows(required_sections)
+
+    candidates = None
+    if prefilter_k is not None and prefilter_k < len(sentences):
+        per_section = section_candidates(required_sections, sentences, prefilter_k)
+        candidates = [per_section[section] for section, _ in rows]
+
+    matrix = score_matrix(model, [kw for _, kw in rows], sentences,
+                          batch_size=batch_size, candidates=candidates)
+    return matrix, rows
+
+
+def section_threshold(threshold, section):
+    # threshold is one number for every section, or {section: number} from the rubric
+    if isinstance(threshold, dict):
+        return threshold[section]
+    return threshold
+
+
+def reduce_sections(matrix, rows, sentences, threshold):
+    # best sentence per keyword, then best keyword per section
+    results = {}
+    if matrix.shape[1] == 0:
+        for section, _ in rows:
+            results[section] = {"found": False, "score": 0, "sentence": "", "matched_by": "model"}
+        return results
+
+    best_idx = matrix.argmax(axis=1)
+    best_prob = matrix[np.arange(matrix.shape[0]), best_idx]
+
+    # rows for one section are contiguous, so each section is a slice
+    start = 0
+    while start < len(rows):
+        section = rows[start][0]
+        end = start
+        while end < len(rows) and rows[end][0] == section:
+            end += 1
+
+        k = start + int(np.argmax(best_prob[start:end]))
+        score = float(best_prob[k])
+        results[section] = {
+            "found": score >= section_threshold(threshold, section),
+            "score": score,
+            "sentence": sentences[best_idx[k]],
+            "matched_by": "model",
+        }
+        start = end
+
+    return results
+
+
+def detect_sections(model, required_sections, sentences, threshold, batch_size=DEFAULT_BATCH_SIZE,
+                    prefilter_k=None, phrase_fast_path=False):
+    # prefilter_k: only send the top-k BM25 candidates per section to the model (None = score everything)
+    # phrase_fast_path: sections whose keyword phrase appears verbatim are marked found without the model
+    hits = phrase_hits(required_sections, sentences) if phrase_fast_path else {}
+
+    remaining = {sec: kws for sec, kws in required_sections.items() if sec not in hits}
+    scored = {}
+    if remaining:
+        matrix, rows = section_score_matrix(model, remaining, sentences,
+                                            batch_size=batch_size, prefilter_k=prefilter_k)
+        scored = reduce_sections(matrix, rows, sentences, threshold)
+
+    # keep rubric order in the results
+    results = {}
+    for section in required_sections:
+        if section in hits:
+            # no model score for these, the phrase alone decides
+            results[section] = {"found": True, "score": None, "sentence": sentences[hits[section]],
+                                "matched_by": "phrase"}
+        else:
+            results[section] = scored[section]
+    return results
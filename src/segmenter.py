@@ -0,0 +1,80 @@
+import re
+
+# Sentence segmentation for scoring.
+# split_sentences() keeps every sentence (readability needs the real text),
+# segment() then builds the list that is actually sent to the model:
+# duplicates collapsed (repeated table rows, policy lines, headers) and very
+# long newline-free chunks cut into bounded windows, with a mapping back to
+# the original sentences.
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+HAS_WORD = re.compile(r"[A-Za-z]{3,}")
+
+# ~100 words stays well under the cross-encoder's 512 token limit
+MAX_WORDS = 96
+WINDOW_OVERLAP = 16
+
+
+def split_sentences(text):
+    return [
+        s.strip()
+        for s in SENTENCE_SPLIT.split(text)
+        if (len(s.split()) >= 2 and HAS_WORD.search(s))
+    ]
+
+
+def normalize(sentence):
+    # the model only ever sees lowercase text, and whitespace does not change the tokens
+    return " ".join(sentence.lower().split())
+
+
+def windows(sentence, max_words=MAX_WORDS, overlap=WINDOW_OVERLAP):
+    words = sentence.split()
+    if len(words) <= max_words:
+        return [sentence]
+    step = max_words - overlap
+    out = []
+    for start in range(0, len(words), step):
+        out.append(" ".join(words[start:start + max_words]))
+        if start + max_words >= len(words):
+            break
+    return out
+
+
+class Segments:
+    # texts[i] is what gets scored; origins[i] lists the indices of the original
+    # sentences it came from (several for duplicates, one for each window of a long chunk)
+
+    def __init__(self):
+        self.texts = []
+        self.origins = []
+        self._index = {}
+
+    def add(self, text, origin):
+        key = normalize(text)
+        i = self._index.get(key)
+        if i is None:
+            i = len(self.texts)
+            self._index[key] = i
+            self.texts.append(text)
+            self.origins.append([])
+        origins = self.origins[i]
+        if not origins or origins[-1] != origin:
+            origins.append(origin)
+        return i
+
+    def __contains__(self, text):
+        return normalize(text) in self._index
+
+    def __len__(self):
+        return len(self.texts)
+
+
+def segment(sentences, max_words=MAX_WORDS, segments=None, start=0):
+    # pass an existing Segments (and the index of the first sentence) to keep
+    # de-duplicating across calls, e.g. page by page
+    segments = segments if segments is not None else Segments()
+    for origin, sentence in enumerate(sentences, start=start):
+        for text in windows(sentence, max_words=max_words):
+            segments.add(text, origin)
+    return segments
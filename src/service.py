@@ -0,0 +1,434 @@
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from batch_check import percentile
+from inference_backends import BACKENDS
+from length_batching import DEFAULT_TOKEN_BUDGET
+from metrics import AnalysisMetrics
+
+# Local HTTP service: the model is loaded once at startup and every upload is
+# analyzed by a small pool of threads, so a portal can call the checker without
+# paying for a new process (and a new model) per syllabus.
+#
+#   python service.py --port 8765 --workers 2 --queue 8
+#
+#   POST /analyze   PDF as the raw body (filename in ?filename= or X-Filename)
+#                   or as a multipart/form-data upload; returns the report as JSON
+#   GET  /health    liveness + whether the model is ready (503 "loading" until it is)
+#   GET  /metrics   request counters, queue depth and latency percentiles
+#
+# The file name matters (course, instructor and level are parsed from it), so
+# uploads should keep the usual CMPSC_303_Smith_FA25.pdf style name.
+
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+LATENCY_WINDOW = 1000     # latencies kept for the p50 / p95 in /metrics
+RETRY_AFTER = 5           # seconds, sent with 503 when the queue is full or the model is loading
+
+SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class QueueFull(Exception):
+    pass
+
+
+class NotReady(Exception):
+    # the model is still loading (or failed to load)
+    pass
+
+
+class AnalysisService:
+    # runs check_syllabus on a fixed number of threads with a bounded wait queue;
+    # submit() raises QueueFull instead of letting requests pile up.
+    # The model is loaded on a background thread, so the server can answer /health
+    # ("loading") right away; submit() raises NotReady until the model is warm.
+
+    def __init__(self, model=None, workers=2, queue_size=8, options=None, cache=None, micro_batch=False,
+                 score_cache=None):
+        from rubric import load_rubric
+
+        self.options = dict(options or {})
+        # compiled once here and shared by every request (options["rubric"]: path, None = default)
+        self.rubric = load_rubric(self.options.get("rubric"))
+        self.cache = cache
+        self.score_cache = score_cache
+        self.workers = workers
+        self.queue_size = queue_size
+
+        self.model = None
+        self.batcher = None
+        self.load_error = None
+        self.ready = threading.Event()
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._stage_seconds = {}
+        self.counters = {"requests": 0, "completed": 0, "failed": 0, "rejected": 0,
+                         "in_flight": 0, "queued": 0}
+
+        self._loader = threading.Thread(target=self._load, args=(model, micro_batch),
+                                        name="model-loader", daemon=True)
+        self._loader.start()
+
+    def _load(self, model, micro_batch):
+        from model_registry import resolve_model, warm_up
+
+        try:
+            if self.options.get("engine") == "bi":
+                from bi_encoder import keyword_embeddings, resolve_encoder
+                loaded = resolve_encoder(model)
+                keyword_embeddings(loaded, self.rubric.sections)
+            elif model is None or isinstance(model, str):
+                loaded = warm_up(model, self.options.get("backend"))
+            else:
+                loaded = resolve_model(model)
+                loaded.predict([("warm up", "warm up the model.")], show_progress_bar=False)
+
+            # concurrent analyses share full model batches instead of each sending its own
+            if micro_batch and self.workers > 1 and self.options.get("engine") != "bi":
+                from micro_batcher import MicroBatcher
+                self.batcher = MicroBatcher(loaded)
+            self.model = loaded
+        except Exception as e:
+            self.load_error = f"Model failed to load: {e}"
+        finally:
+            self.ready.set()
+
+    def wait_ready(self, timeout=None):
+        # True once the model is loaded, False on timeout or if loading failed
+        return self.ready.wait(timeout) and self.model is not None
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def submit(self, pdf_bytes, filename):
+        # returns a Future resolving to (report dict, metrics dict)
+        self._count("requests")
+        if self.model is None:
+            self._count("rejected")
+            raise NotReady(self.load_error or "Model is still loading, try again shortly.")
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise QueueFull()
+        self._count("queued")
+        try:
+            return self._pool.submit(self._run, pdf_bytes, filename)
+        except Exception:
+            self._count("queued", -1)
+            self._slots.release()
+            raise
+
+    def _run(self, pdf_bytes, filename):
+        from Syllabus_Checker_For_GUI import check_syllabus
+
+        self._count("queued", -1)
+        self._count("in_flight")
+        metrics = AnalysisMetrics()
+        start = time.perf_counter()
+        ok = False
+        try:
+            with tempfile.TemporaryDirectory(prefix="syllabus_") as folder:
+                path = os.path.join(folder, filename)
+                with open(path, "wb") as f:
+                    f.write(pdf_bytes)
+                report = check_syllabus(
+                    path,
+                    model=self.batcher or self.model,
+                    prefilter_k=self.options.get("prefilter_k"),
+                    phrase_fast_path=self.options.get("phrase_fast_path", True),
+                    cache=self.cache,
+                    streaming=self.options.get("streaming", False),
+                    metrics=metrics,
+                    engine=self.options.get("engine", "cross"),
+                    score_cache=self.score_cache,
+                    rubric=self.rubric,
+                    # the batcher already sorts and buckets the pairs of every waiting document;
+                    # bucketing each document first would only split it into small requests
+                    token_budget=None if self.batcher is not None else DEFAULT_TOKEN_BUDGET,
+                )
+            ok = report.error is None
+            return report, metrics.to_dict()
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.counters["in_flight"] -= 1
+                self.counters["completed" if ok else "failed"] += 1
+                self._latencies.append(elapsed)
+                for stage, t in metrics.stages.items():
+                    self._stage_seconds[stage] = self._stage_seconds.get(stage, 0.0) + t["wall"]
+            self._slots.release()
+
+    def health(self):
+        if self.model is not None:
+            status = "ok"
+        else:
+            status = "error" if self.load_error else "loading"
+        data = {
+            "status": status,
+            "model": _model_label(self.model),
+            "rubric": self.rubric.label,
+            "uptime_seconds": round(time.time() - self.started, 1),
+        }
+        if self.load_error:
+            data["error"] = self.load_error
+        return data
+
+    def metrics(self):
+        with self._lock:
+            latencies = list(self._latencies)
+            data = dict(self.counters)
+            stages = {k: round(v, 3) for k, v in self._stage_seconds.items()}
+        data.update({
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "p50_seconds": round(percentile(latencies, 50), 4),
+            "p95_seconds": round(percentile(latencies, 95), 4),
+            "stage_seconds": stages,
+        })
+        if self.batcher is not None:
+            data["micro_batches"] = dict(self.batcher.stats)
+        if self.score_cache is not None:
+            data["score_cache"] = self.score_cache.stats()
+        if self.cache is not None:
+            data["cache_hits"] = self.cache.hits
+            data["cache_misses"] = self.cache.misses
+        return data
+
+    def shutdown(self):
+        self._loader.join()
+        self._pool.shutdown(wait=True)
+        if self.batcher is not None:
+            self.batcher.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.score_cache is not None:
+            self.score_cache.close()
+
+
+def _model_label(model):
+    from model_registry import model_name
+    return model_name(model) if model is not None else None
+
+
+def safe_filename(name):
+    # keep only the base name and characters that are fine on every OS
+    name = SAFE_NAME.sub("_", os.path.basename(name or "").strip())
+    name = name.lstrip(".") or "upload.pdf"
+    return name
+
+
+def read_upload(headers, body, query):
+    # returns (pdf bytes, file name) from a raw application/pdf body or a multipart form
+    content_type = headers.get("Content-Type", "")
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        for part in message.iter_parts():
+            filename = part.get_filename()
+            if filename:
+                return part.get_payload(decode=True), filename
+        raise ValueError("No file found in the form upload.")
+
+    filename = (query.get("filename") or [None])[0] or headers.get("X-Filename")
+    if not filename:
+        raise ValueError("Missing file name (use ?filename= or the X-Filename header).")
+    return body, filename
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    service = None         # set by make_server
+    request_timeout = 300  # seconds a request waits for its analysis
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            health = self.service.health()
+            if health["status"] == "ok":
+                self._send_json(200, health)
+            else:
+                # load balancers and portals should not send uploads here yet
+                self._send_json(503, health, headers={"Retry-After": str(RETRY_AFTER)})
+        elif path == "/metrics":
+            self._send_json(200, self.service.metrics())
+        else:
+            self._send_json(404, {"error": "Not found."})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/analyze":
+            self._send_json(404, {"error": "Not found."})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length <= 0:
+            self._send_json(411, {"error": "A Content-Length with the PDF size is required."})
+            return
+        if length > MAX_UPLOAD_BYTES:
+            self._send_json(413, {"error": f"Uploads are limited to {MAX_UPLOAD_BYTES // (1024 * 1024)} MB."})
+            return
+        body = self.rfile.read(length)
+
+        query = parse_qs(url.query)
+        try:
+            pdf_bytes, filename = read_upload(self.headers, body, query)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        filename = safe_filename(filename)
+        if not filename.lower().endswith(".pdf") or not pdf_bytes.startswith(b"%PDF"):
+            self._send_json(400, {"error": "Error: Only PDF files are accepted."})
+            return
+
+        try:
+            future = self.service.submit(pdf_bytes, filename)
+        except QueueFull:
+            self._send_json(503, {"error": "Server busy, try again shortly."},
+                            headers={"Retry-After": str(RETRY_AFTER)})
+            return
+        except NotReady as e:
+            self._send_json(503, {"error": str(e)}, headers={"Retry-After": str(RETRY_AFTER)})
+            return
+
+        try:
+            report, metrics = future.result(timeout=self.request_timeout)
+        except ValueError as e:
+            # check_syllabus rejects the file itself (name not COURSE_NUM_Instructor_TERM, ...)
+            self._send_json(422, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        data = report.to_dict()
+        data["metrics"] = metrics
+        if query.get("report", ["0"])[0] not in ("", "0", "false"):
+            from report_render import render_text
+            data["report"] = render_text(report, rubric=self.service.rubric)
+        self._send_json(422 if report.error else 200, data)
+
+
+def make_server(host="127.0.0.1", port=8765, service=None, quiet=False, **service_args):
+    # port 0 picks a free port (server.server_address has the real one)
+    service = service or AnalysisService(**service_args)
+    handler = type("Handler", (AnalysisHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve syllabus checks over HTTP with the model kept loaded.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-w", "--workers", type=int, default=2, help="analyses run at the same time")
+    parser.add_argument("--queue", type=int, default=8, help="requests allowed to wait before answering 503")
+    parser.add_argument("--model", default=None, help="CrossEncoder name or local path ('stub' for offline testing)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="how the CrossEncoder runs (default: $SYLLABUS_CHECKER_BACKEND or torch)")
+    parser.add_argument("--engine", choices=("cross", "bi"), default="cross",
+                        help="'bi' trades some accuracy for speed (see bi_encoder.py)")
+    parser.add_argument("--prefilter-k", type=int, default=None, help="BM25 candidates per section")
+    parser.add_argument("--no-phrase-fast-path", action="store_true", help="always use the model")
+    parser.add_argument("--streaming", action="store_true",
+                        help="score page by page and stop reading once every section is found")
+    parser.add_argument("--cache", default=None, help="result cache file (re-uploads are answered from it)")
+    parser.add_argument("--score-cache", default=None,
+                        help="SQLite file of (keyword, sentence) scores reused across syllabi")
+    parser.add_argument("--micro-batch", action="store_true",
+                        help="combine model batches across concurrent analyses (helps with --workers > 1)")
+    parser.add_argument("--rubric", default=None,
+                        help="rubric JSON file (default: $SYLLABUS_CHECKER_RUBRIC or rubric.json)")
+    parser.add_argument("--quiet", action="store_true", help="do not log every request")
+    args = parser.parse_args(argv)
+
+    model = args.model
+    if model == "stub":
+        from stub_model import StubCrossEncoder
+        model = StubCrossEncoder()
+
+    cache = None
+    if args.cache:
+        from result_cache import ResultCache
+        cache = ResultCache(args.cache)
+
+    score_cache = None
+    if args.score_cache:
+        from score_cache import ScoreCache
+        score_cache = ScoreCache(args.score_cache)
+
+    service = AnalysisService(
+        model=model,
+        workers=args.workers,
+        queue_size=args.queue,
+        cache=cache,
+        micro_batch=args.micro_batch,
+        score_cache=score_cache,
+        options={
+            "prefilter_k": args.prefilter_k,
+            "phrase_fast_path": not args.no_phrase_fast_path,
+            "streaming": args.streaming,
+            "engine": args.engine,
+            "backend": args.backend,
+            "rubric": args.rubric,
+        },
+    )
+    server = make_server(args.host, args.port, service=service, quiet=args.quiet)
+    host, port = server.server_address[:2]
+    print(f"Listening on http://{host}:{port} ({args.workers} worker(s), queue {args.queue})")
+    print("Loading model... (/health answers 503 until it is ready)")
+
+    def report_ready():
+        if service.wait_ready():
+            print(f"Model ready: {_model_label(service.model)}")
+        else:
+            print(service.load_error, file=sys.stderr)
+
+    threading.Thread(target=report_ready, daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import time
+import zlib
+
+import numpy as np
+
+from length_batching import estimate_tokens
+
+# Offline stand-in for the CrossEncoder, used by benchmark.py, golden.py and
+# "--model stub" in service.py, and by the tests: no torch, no download.
+
+
+class StubCrossEncoder:
+    # offline stand-in for the CrossEncoder: deterministic word-overlap scores,
+    # cheap enough that the numbers show the cost of everything around the model.
+    # token_cost (seconds per padded token) makes it as slow as a real forward
+    # pass over padded batches, to see the effect of batching.
+
+    def __init__(self, token_cost=0.0):
+        self.pairs = 0
+        self.padded_tokens = 0
+        self.token_cost = token_cost
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False, **kwargs):
+        pairs = list(pairs)
+        self.pairs += len(pairs)
+        padded = 0
+        for start in range(0, len(pairs), batch_size):
+            lengths = estimate_tokens(pairs[start:start + batch_size])
+            padded += int(lengths.max()) * len(lengths)
+        self.padded_tokens += padded
+        if self.token_cost:
+            time.sleep(padded * self.token_cost)
+        out = np.empty(len(pairs), dtype=np.float32)
+        for i, (query, sentence) in enumerate(pairs):
+            if query in sentence:
+                out[i] = 4.0
+            else:
+                q = set(query.split())
+                overlap = len(q.intersection(sentence.split())) / max(len(q), 1)
+                out[i] = -5.0 + 4.0 * overlap + (zlib.crc32(sentence.encode()) % 100) / 1000
+        return out
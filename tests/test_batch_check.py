@@ -0,0 +1,23 @@
+import json
+
+from batch_check import already_done
+
+
+def test_failed_records_are_not_done(tmp_path):
+    out = tmp_path / "results.jsonl"
+    records = [
+        {"file": "/s/ok.pdf", "sections": [], "error": None},
+        {"file": "/s/oom.pdf", "error": "CUDA out of memory"},
+        {"file": "/s/unreadable.pdf", "sections": [], "error": "Error: Could not read the PDF."},
+        {"file": "/s/retried.pdf", "error": "worker crashed"},
+        {"file": "/s/retried.pdf", "sections": [], "error": None},
+    ]
+    lines = [json.dumps(r) for r in records]
+    # a line cut off by a crash
+    out.write_text("\n".join(lines) + "\n" + lines[0][:20], encoding="utf-8")
+
+    assert already_done(str(out)) == {"/s/ok.pdf", "/s/retried.pdf"}
+
+
+def test_missing_output_file(tmp_path):
+    assert already_done(str(tmp_path / "nothing.jsonl")) == set()
@@ -0,0 +1,23 @@
+from boilerplate import strip_repeated_lines
+
+HEADER = "Instructor contact: Dr. Smith, email smith@psu.edu"
+
+
+def page(n, body_lines=10):
+    body = [f"Week {n} line {i}: students read chapter {i} and discuss it in class." for i in range(body_lines)]
+    return "\n".join([HEADER] + body + [f"Page {n} of 4"])
+
+
+def test_keeps_first_copy_of_repeated_lines():
+    cleaned, removed = strip_repeated_lines([page(n) for n in range(1, 5)])
+    text = "\n".join(cleaned)
+    assert text.count(HEADER) == 1
+    assert text.count("Page ") == 1
+    assert removed == 6
+
+
+def test_short_pages_are_left_alone():
+    pages = [f"{HEADER}\nShort page {n}.\nPage {n} of 4" for n in range(1, 5)]
+    cleaned, removed = strip_repeated_lines(pages)
+    assert cleaned == pages
+    assert removed == 0
@@ -0,0 +1,30 @@
+from golden import DEFAULT_MODES, _mode_args, compare, corpus_files, record, run_check
+from stub_model import StubCrossEncoder
+
+
+def test_generated_corpus_has_no_disagreements(tmp_path):
+    # every default mode against the unsegmented, unshortcut reference, on the synthetic corpus
+    model = StubCrossEncoder()
+    files = corpus_files([], True, str(tmp_path), 1234)
+    golden = record(files, model, "stub", str(tmp_path / "golden.json"), generated=True, log=lambda *_: None)
+    assert len(golden["files"]) == len(files)
+
+    results = compare(golden, files, model, "stub", DEFAULT_MODES, log=lambda *_: None)
+    assert sorted(results) == sorted(DEFAULT_MODES)
+    for mode, summary in results.items():
+        assert summary["files"] == len(files), mode
+        assert summary["disagreements"] == [], mode
+
+
+def test_phrase_matches_are_not_compared_as_scores(tmp_path):
+    model = StubCrossEncoder()
+    files = corpus_files([], True, str(tmp_path), 1234)[:1]
+    golden = record(files, model, "stub", str(tmp_path / "golden.json"), generated=True, log=lambda *_: None)
+
+    # the mode does decide sections by phrase here, with no score to compare
+    report, _ = run_check(files[0][1], _mode_args("phrase_fast_path", model, "stub", str(tmp_path)))
+    assert any(s.matched_by == "phrase" and s.score is None for s in report.sections)
+
+    results = compare(golden, files, model, "stub", ["phrase_fast_path"], log=lambda *_: None)
+    assert results["phrase_fast_path"]["disagreements"] == []
+    assert results["phrase_fast_path"]["max_score_diff"] <= 0.05
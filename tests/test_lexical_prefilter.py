@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from benchmark import make_syllabus_pdf
+from lexical_prefilter import BM25Index, section_candidates, stem
+from rubric import load_rubric
+from stub_model import StubCrossEncoder
+from Syllabus_Checker_For_GUI import check_syllabus
+
+
+def test_stem():
+    assert stem("exams") == stem("exam") == "exam"
+    assert stem("attendance") == stem("attend") == "attend"
+    assert stem("disabilities") == stem("disability") == "disabi"
+    assert stem("is") == "is"
+
+
+def test_overlapping_sentences_first_then_document_order():
+    sentences = [
+        "Welcome to the course.",
+        "Read chapter one before class.",
+        "Exams are given in week five and week ten.",
+        "Bring a calculator.",
+        "There is no final exam.",
+    ]
+    index = BM25Index(sentences)
+    assert list(index.top_k("exam", 3)) == [0, 2, 4]
+
+
+def test_no_overlap_falls_back_to_the_first_sentences():
+    sentences = [f"Filler sentence number {i} here." for i in range(10)]
+    index = BM25Index(sentences)
+    assert not index.scores("academic integrity").any()
+    assert list(index.top_k("academic integrity", 4)) == [0, 1, 2, 3]
+
+    candidates = section_candidates({"Academic Integrity": ["academic integrity"]}, sentences, 4)
+    np.testing.assert_array_equal(candidates["Academic Integrity"], [0, 1, 2, 3])
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_prefilter_finds_what_scoring_everything_finds(tmp_path, seed):
+    sections = list(load_rubric().sections)
+    present = sections[seed::2]
+    path = str(tmp_path / "CMPSC_303_Smith_FA25.pdf")
+    make_syllabus_pdf(path, 6, 20, present, seed=seed)
+
+    model = StubCrossEncoder()
+    full = check_syllabus(path, model=model, prefilter_k=None, phrase_fast_path=False, token_budget=None)
+    pruned = check_syllabus(path, model=model, prefilter_k=25, phrase_fast_path=False, token_budget=None)
+
+    assert pruned.found == full.found
+    for a, b in zip(full.sections, pruned.sections):
+        # pruning can only lose sentences, never score one higher than the full pass
+        assert b.score <= a.score + 1e-6
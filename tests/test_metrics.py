@@ -0,0 +1,26 @@
+import threading
+import time
+
+from metrics import AnalysisMetrics
+
+
+def test_stage_cpu_is_only_this_thread():
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            pass
+
+    busy = threading.Thread(target=spin)
+    busy.start()
+    metrics = AnalysisMetrics()
+    try:
+        with metrics.stage("waiting"):
+            time.sleep(0.3)
+    finally:
+        stop.set()
+        busy.join()
+
+    stage = metrics.to_dict()["stages"]["waiting"]
+    assert stage["wall"] >= 0.3
+    assert stage["cpu"] < 0.1
@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+import pytest
+
+from micro_batcher import MicroBatcher
+from stub_model import StubCrossEncoder
+
+
+def make_pairs(doc, n):
+    # lengths vary inside each document, so length bucketing reorders them
+    return [(f"keyword {i % 3}", f"document {doc} sentence {i} " + "word " * ((i * 7 + doc) % 40))
+            for i in range(n)]
+
+
+class FailingModel(StubCrossEncoder):
+    def __init__(self):
+        super().__init__()
+        self.fail = True
+
+    def predict(self, pairs, **kwargs):
+        if self.fail:
+            raise RuntimeError("out of memory")
+        return super().predict(pairs, **kwargs)
+
+
+def submit_together(batcher, requests):
+    # every request from its own thread, all released at once; returns {i: scores or exception}
+    results = {}
+    start = threading.Barrier(len(requests))
+
+    def run(i, pairs):
+        start.wait()
+        try:
+            results[i] = batcher.predict(pairs)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, pairs)) for i, pairs in enumerate(requests)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    return results
+
+
+@pytest.mark.parametrize("token_budget", [None, 2048])
+def test_scores_match_direct_predict(token_budget):
+    model = StubCrossEncoder()
+    pairs = make_pairs(0, 300)
+    batcher = MicroBatcher(model, batch_size=64, token_budget=token_budget)
+    try:
+        np.testing.assert_array_equal(batcher.predict(pairs), model.predict(pairs))
+    finally:
+        batcher.close()
+
+
+def test_coalesced_requests_get_their_own_scores_in_order():
+    model = StubCrossEncoder()
+    requests = [make_pairs(doc, 20 + 13 * doc) for doc in range(6)]
+    # a long wait and a large batch, so all six documents end up in the same rounds
+    batcher = MicroBatcher(model, batch_size=10_000, max_wait=0.5, token_budget=1024, max_batch=10_000)
+    try:
+        results = submit_together(batcher, requests)
+    finally:
+        batcher.close()
+
+    assert batcher.stats["requests"] == len(requests)
+    assert batcher.stats["rounds"] < len(requests)
+    for i, pairs in enumerate(requests):
+        np.testing.assert_array_equal(results[i], model.predict(pairs))
+
+
+def test_model_error_reaches_every_waiting_caller():
+    model = FailingModel()
+    batcher = MicroBatcher(model, batch_size=10_000, max_wait=0.5, max_batch=10_000)
+    try:
+        results = submit_together(batcher, [make_pairs(doc, 30) for doc in range(4)])
+        assert len(results) == 4
+        for error in results.values():
+            assert isinstance(error, RuntimeError) and "out of memory" in str(error)
+
+        # the scheduler keeps running for later requests
+        model.fail = False
+        pairs = make_pairs(9, 10)
+        np.testing.assert_array_equal(batcher.predict(pairs), model.predict(pairs))
+    finally:
+        batcher.close()
@@ -0,0 +1,28 @@
+import pytest
+
+from phrase_matcher import PhraseMatcher, phrase_hits
+from rubric import load_rubric
+
+
+@pytest.mark.parametrize("sentence", [
+    "Our class timeline is posted on Canvas.",
+    "Please report biased grading to the department.",
+    "The course contents change every year.",
+    "Final grades are posted after the exam week.",
+])
+def test_no_hit_inside_a_longer_word(sentence):
+    assert phrase_hits(load_rubric().sections, [sentence]) == {}
+
+
+def test_hit_on_word_boundaries():
+    sections = load_rubric().sections
+    assert phrase_hits(sections, ["Class time: MWF 10:10am."]) == {"Location and Meeting Times": 0}
+    assert phrase_hits(sections, ["Your final grade is the weighted average."]) == {"Grade Breakdown": 0}
+
+
+def test_find_checks_both_ends():
+    matcher = PhraseMatcher(["class time"])
+    assert list(matcher.find("class time")) == [(0, 0)]
+    assert list(matcher.find("(class time)")) == [(1, 0)]
+    assert list(matcher.find("subclass time")) == []
+    assert list(matcher.find("class timeline")) == []
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from progress import AnalysisCancelled, CancelToken, ProgressModel
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        self.calls += 1
+        return np.array([[len(t), i] for i, t in enumerate(texts)], dtype=np.float32)
+
+
+TEXTS = [f"sentence number {i}" for i in range(100)]
+
+
+def test_encode_in_chunks_matches_one_call():
+    seen = []
+    model = ProgressModel(FakeEncoder(), progress=lambda stage, done, total: seen.append((stage, done, total)))
+    vectors = model.encode(TEXTS, batch_size=32)
+
+    assert model.model.calls == 4
+    assert seen[-1] == ("scoring", 100, 100)
+    expected = np.concatenate([FakeEncoder().encode(TEXTS[i:i + 32]) for i in range(0, 100, 32)])
+    np.testing.assert_array_equal(vectors, expected)
+    np.testing.assert_array_equal(vectors[:, 0], [len(t) for t in TEXTS])
+
+
+def test_encode_stops_between_chunks_on_cancel():
+    token = CancelToken()
+
+    def progress(stage, done, total):
+        token.cancel()
+
+    model = ProgressModel(FakeEncoder(), progress=progress, cancel=token)
+    with pytest.raises(AnalysisCancelled):
+        model.encode(TEXTS, batch_size=32)
+    assert model.model.calls == 1
@@ -0,0 +1,60 @@
+import pytest
+import textstat
+
+from readability import parity_mismatches, readability_scores, scores_from_counts, text_counts
+
+METRICS = ["flesch_reading_ease", "flesch_kincaid_grade", "gunning_fog", "smog_index"]
+
+SYLLABUS = (
+    "This course introduces the design and analysis of algorithms. "
+    "Students will learn sorting, searching, graph traversal and dynamic programming. "
+    "Attendance is required at every lecture and laboratory session. "
+    "Late assignments lose ten percent per day unless an extension was approved in advance. "
+    "Office hours are held on Tuesdays and Thursdays from two to four in the afternoon. "
+    "Academic integrity violations will be reported to the university administration. "
+)
+
+TEXTS = {
+    "empty": "",
+    "whitespace": "   \n\t ",
+    "single sentence": "Students must submit every assignment through the online portal before midnight.",
+    "two sentences": "The final exam is cumulative. It covers every chapter in the textbook.",
+    # 3..29 sentences: SMOG is scored, on far fewer sentences than its formula assumes
+    "few sentences": SYLLABUS,
+    "thirty plus sentences": SYLLABUS * 6,
+    "hyphens and apostrophes": (
+        "The instructor's well-known policy: don't miss the mid-term. "
+        "It's a closed-book, in-person examination that can't be rescheduled. "
+        "Students' self-assessments are due at the end-of-semester review. "
+        "We'll use a state-of-the-art, peer-reviewed grading rubric."
+    ),
+    "headings and lists": (
+        "Grading. Exams: 40%. Homework: 30%. Participation. "
+        "Quizzes are given weekly and the lowest two scores are dropped!"
+        " Questions? Email the teaching assistant first."
+    ),
+    "curly quotes": "‘Plagiarism’ includes paraphrasing without citation. Don’t do it. It’s serious misconduct.",
+}
+
+
+@pytest.mark.parametrize("name", TEXTS)
+def test_scores_match_textstat(name):
+    text = TEXTS[name]
+    ours = readability_scores(text)
+    for metric in METRICS:
+        assert ours[metric] == getattr(textstat, metric)(text), metric
+
+
+def test_smog_needs_three_sentences():
+    assert readability_scores(TEXTS["two sentences"])["smog_index"] == 0.0
+    assert readability_scores(TEXTS["few sentences"])["smog_index"] > 0.0
+
+
+@pytest.mark.parametrize("name", TEXTS)
+def test_counts_path_matches_one_shot(name):
+    text = TEXTS[name]
+    assert scores_from_counts(text_counts(text)) == readability_scores(text)
+
+
+def test_parity_mismatches_reports_nothing():
+    assert parity_mismatches(list(TEXTS.values())) == []
@@ -0,0 +1,26 @@
+import json
+
+from report import SectionResult, SyllabusReport
+from report_render import render_text
+from rubric import DEFAULT_RUBRIC_PATH, load_rubric
+
+
+def test_report_renders_with_its_own_rubric(tmp_path):
+    with open(DEFAULT_RUBRIC_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    data["sections"][0]["name"] = "Instructor Info"
+    data["sections"][0]["recommendation"] = "Add how to reach the instructor."
+    path = tmp_path / "campus.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    rubric = load_rubric(str(path))
+    report = SyllabusReport(
+        sections=[SectionResult(name, False, 0.0, "") for name in rubric.sections],
+        rubric=rubric.label,
+        rubric_path=rubric.path,
+    )
+    text = render_text(report)
+    assert "Add how to reach the instructor." in text
+
+    # also after a round trip through JSON (result cache, batch records)
+    assert render_text(SyllabusReport.from_dict(json.loads(json.dumps(report.to_dict())))) == text
@@ -0,0 +1,42 @@
+import sqlite3
+import time
+
+from score_cache import ScoreCache, sentence_hash
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ScoreCache(str(tmp_path / "scores.sqlite"), max_rows=3)
+    try:
+        for sentence in ("first", "second", "third"):
+            cache.store("m", [("kw", sentence)], [1.0])
+            time.sleep(0.01)
+        # the oldest row is read again, so it is not the next to go
+        assert cache.lookup("m", [("kw", "first")]) == [1.0]
+        time.sleep(0.01)
+        cache.store("m", [("kw", "fourth")], [4.0])
+
+        assert len(cache) == 3
+        assert cache.lookup("m", [("kw", s) for s in ("first", "second", "third", "fourth")]) \
+            == [1.0, None, 1.0, 4.0]
+    finally:
+        cache.close()
+
+
+def test_opens_a_file_without_last_used(tmp_path):
+    path = str(tmp_path / "scores.sqlite")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE scores (model TEXT NOT NULL, keyword TEXT NOT NULL, sentence BLOB NOT NULL,"
+               " score REAL NOT NULL, UNIQUE (model, keyword, sentence))")
+    db.execute("INSERT INTO scores VALUES (?, ?, ?, ?)", ("m", "kw", sentence_hash("old"), 2.0))
+    db.commit()
+    db.close()
+
+    cache = ScoreCache(path, max_rows=1)
+    try:
+        assert cache.lookup("m", [("kw", "old")]) == [2.0]
+        time.sleep(0.01)
+        cache.store("m", [("kw", "new")], [3.0])
+        assert len(cache) == 1
+        assert cache.lookup("m", [("kw", "old"), ("kw", "new")]) == [None, 3.0]
+    finally:
+        cache.close()
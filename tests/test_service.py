@@ -0,0 +1,150 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmark import make_syllabus_pdf
+from service import make_server
+from stub_model import StubCrossEncoder
+
+
+class GatedModel(StubCrossEncoder):
+    # blocks predict() while the gate is closed, to keep an analysis in flight
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def predict(self, pairs, **kwargs):
+        self.entered.set()
+        self.gate.wait(10)
+        return super().predict(pairs, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes(tmp_path_factory):
+    path = tmp_path_factory.mktemp("pdf") / "syllabus.pdf"
+    make_syllabus_pdf(str(path), 2, 12, ["Contact Information", "Attendance Policy"], seed=1)
+    return path.read_bytes()
+
+
+@pytest.fixture
+def server():
+    model = GatedModel()
+    server = make_server("127.0.0.1", 0, quiet=True, model=model, workers=1, queue_size=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    server.url = f"http://{host}:{port}"
+    server.model = model
+    assert server.service.wait_ready(10)
+    yield server
+    model.gate.set()
+    server.shutdown()
+    server.server_close()
+    server.service.shutdown()
+
+
+def request(url, data=None, headers=None):
+    # (status, headers, json body); HTTP errors are returned, not raised
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return resp.status, resp.headers, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, json.loads(e.read())
+
+
+def analyze(server, pdf, filename="CMPSC_303_Smith_FA25.pdf", query=""):
+    return request(f"{server.url}/analyze?filename={filename}{query}", data=pdf,
+                   headers={"Content-Type": "application/pdf"})
+
+
+def test_health(server):
+    status, _, body = request(f"{server.url}/health")
+    assert status == 200
+    assert body["status"] == "ok"
+    assert body["rubric"]
+
+
+def test_health_while_loading(pdf_bytes):
+    model = GatedModel()
+    model.gate.clear()   # the warm-up predict blocks: the model is still loading
+    server = make_server("127.0.0.1", 0, quiet=True, model=model, workers=1, queue_size=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    server.url = f"http://{host}:{port}"
+    try:
+        assert model.entered.wait(10)
+        status, headers, body = request(f"{server.url}/health")
+        assert status == 503
+        assert body["status"] == "loading"
+        assert int(headers["Retry-After"]) > 0
+
+        status, _, body = analyze(server, pdf_bytes)
+        assert status == 503
+
+        model.gate.set()
+        assert server.service.wait_ready(10)
+        status, _, body = request(f"{server.url}/health")
+        assert status == 200
+        assert body["status"] == "ok"
+        assert analyze(server, pdf_bytes)[0] == 200
+    finally:
+        model.gate.set()
+        server.shutdown()
+        server.server_close()
+        server.service.shutdown()
+
+
+def test_analyze(server, pdf_bytes):
+    status, _, body = analyze(server, pdf_bytes, query="&report=1")
+    assert status == 200
+    assert body["course"] == "CMPSC.303"
+    assert "Contact Information" in [s["name"] for s in body["sections"] if s["found"]]
+    assert "CONTENT ANALYSIS REPORT" in body["report"]
+    assert body["metrics"]["counters"]["model_calls"] >= 1
+
+
+def test_rejects_bad_uploads(server, pdf_bytes):
+    status, _, body = analyze(server, b"not a pdf", filename="notes.txt")
+    assert status == 400
+
+    # not a COURSE_NUM_Instructor_TERM.pdf name: a client error, not a server error
+    status, _, body = analyze(server, pdf_bytes, filename="bad.pdf")
+    assert status == 422
+    assert "bad" in body["error"]
+
+
+def test_backpressure(server, pdf_bytes):
+    server.model.gate.clear()
+    server.model.entered.clear()
+    results = []
+    first = threading.Thread(target=lambda: results.append(analyze(server, pdf_bytes)))
+    first.start()
+    assert server.model.entered.wait(10)
+
+    # one worker, no queue: the second upload is turned away right away
+    status, headers, body = analyze(server, pdf_bytes)
+    assert status == 503
+    assert int(headers["Retry-After"]) > 0
+
+    server.model.gate.set()
+    first.join(30)
+    assert results[0][0] == 200
+
+
+def test_metrics(server, pdf_bytes):
+    analyze(server, pdf_bytes)
+    analyze(server, pdf_bytes, filename="bad.pdf")
+    status, _, body = request(f"{server.url}/metrics")
+    assert status == 200
+    assert body["requests"] == 2
+    assert body["completed"] == 1
+    assert body["failed"] == 1
+    assert body["in_flight"] == 0
+    assert body["p95_seconds"] >= body["p50_seconds"] > 0